@@ -1,13 +1,23 @@
 from app.agent.state import AgentState
-from app.agent.tooling import GUARDED_ACTIONS, TOOLS
-from app.agent.runtime import assistant, execute_action, route_after_assistant, route_after_execute
+from app.agent.tooling import GUARDED_ACTIONS, TOOL_BY_NAME, TOOLS
+from app.agent.runtime import (
+    assistant,
+    direct_responder,
+    execute_action,
+    route_after_assistant,
+    route_after_execute,
+    route_from_start,
+)
 
 __all__ = [
     "AgentState",
     "GUARDED_ACTIONS",
     "TOOLS",
+    "TOOL_BY_NAME",
     "assistant",
+    "direct_responder",
     "execute_action",
     "route_after_assistant",
     "route_after_execute",
+    "route_from_start",
 ]
@@ -1,15 +1,23 @@
 from __future__ import annotations
 
+import hashlib
+import inspect
 import json
 import os
 import random
+import re
+import threading
 import time
-from datetime import datetime, timezone
-from typing import Any, Literal
-from zoneinfo import ZoneInfo
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone, tzinfo
+from functools import lru_cache
+from typing import Any, Callable, Literal
 
+import httpx
 from dotenv import load_dotenv
-from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage, message_chunk_to_message
+from langchain_core.runnables import RunnableConfig
 from langchain_groq import ChatGroq
 
 try:
@@ -17,10 +25,16 @@ try:
 except Exception:  # pragma: no cover - optional dependency
     ChatOllama = None
 
+from app.agent import semantic_cache
 from app.agent.state import AgentState
-from app.agent.tooling import GUARDED_ACTIONS, TOOLS
+from app.agent.streaming import stream_callback
+from app.agent.tooling import BOUND_TOOLS, GUARDED_ACTIONS, TEXT_CONTENT_TOOLS, TOOL_BY_NAME
+from app.agent.tools.common import to_tool_content
+from app.caching import TTLCache
+from app.env import env_int, env_true
 from app.observability import langsmith_traceable, timed
-from app.tools.calendar import effective_timezone_name
+from app.serialization import dumps, loads
+from app.tools.calendar import effective_timezone_name, zone_for
 
 load_dotenv()
 
@@ -29,14 +43,79 @@ GROQ_API_KEY = (os.getenv("GROQ_API_KEY", "") or "").strip().strip('"').strip("'
 OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "qwen2.5:7b")
 OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
 
-LLM = ChatGroq(model=MODEL_NAME, temperature=0, api_key=GROQ_API_KEY)
-LLM_WITH_TOOLS = LLM.bind_tools(TOOLS)
-OLLAMA_LLM = (
-    ChatOllama(model=OLLAMA_MODEL, base_url=OLLAMA_BASE_URL, temperature=0)
-    if ChatOllama is not None
-    else None
+# One keep-alive pool shared by every Groq request, so turns after the first
+# skip the TCP/TLS handshake. Sized to keep a connection warm for each of the
+# Telegram bot's concurrent graph workers.
+GROQ_HTTP_CLIENT = httpx.Client(
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=32, keepalive_expiry=60),
+    timeout=httpx.Timeout(60.0, connect=10.0),
 )
-OLLAMA_WITH_TOOLS = OLLAMA_LLM.bind_tools(TOOLS) if OLLAMA_LLM is not None else None
+
+PREWARM_GROQ = env_true("AGENT_PREWARM_GROQ", True)
+GROQ_BASE_URL = os.getenv("GROQ_BASE_URL", "https://api.groq.com").rstrip("/")
+_prewarm_started = threading.Event()
+
+
+def prewarm_llm_connection() -> None:
+    """Open the Groq keep-alive connection in the background.
+
+    A cheap authenticated GET puts a warm TCP/TLS connection in
+    GROQ_HTTP_CLIENT's pool, so the first real turn skips the handshake.
+    Runs at most once per process; failures are ignored.
+    """
+    if not PREWARM_GROQ or not GROQ_API_KEY or _prewarm_started.is_set():
+        return
+    _prewarm_started.set()
+
+    def _warm() -> None:
+        try:
+            GROQ_HTTP_CLIENT.get(
+                f"{GROQ_BASE_URL}/openai/v1/models",
+                headers={"Authorization": f"Bearer {GROQ_API_KEY}"},
+            )
+        except Exception:
+            pass
+
+    threading.Thread(target=_warm, name="groq-prewarm", daemon=True).start()
+
+
+# Model clients are built on first use so importing the graph stays cheap for
+# entrypoints and scripts that never reach the LLM.
+@lru_cache(maxsize=1)
+def _llm() -> ChatGroq:
+    return ChatGroq(model=MODEL_NAME, temperature=0, api_key=GROQ_API_KEY, http_client=GROQ_HTTP_CLIENT)
+
+
+@lru_cache(maxsize=1)
+def _llm_with_tools():
+    return _llm().bind_tools(BOUND_TOOLS)
+
+
+@lru_cache(maxsize=1)
+def _ollama_llm():
+    if ChatOllama is None:
+        return None
+    return ChatOllama(model=OLLAMA_MODEL, base_url=OLLAMA_BASE_URL, temperature=0)
+
+
+@lru_cache(maxsize=1)
+def _ollama_with_tools():
+    ollama = _ollama_llm()
+    return ollama.bind_tools(BOUND_TOOLS) if ollama is not None else None
+
+# Runs batches of read-only tool calls concurrently. Long-lived so the
+# per-thread Google service caches survive between turns.
+_TOOL_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="tools")
+
+RESPONSE_CACHE_ENABLED = env_true("AGENT_RESPONSE_CACHE")
+# 0 keeps the default compaction (latest human message + latest tool exchange).
+HISTORY_TURNS = env_int("AGENT_HISTORY_TURNS", 0, minimum=0)
+# Keys change every minute, so entries never need to live longer than that.
+_RESPONSE_CACHE = TTLCache(maxsize=1024, ttl=60)
+_TOOL_SCHEMA_VERSION = hashlib.blake2b(
+    json.dumps([(t.name, t.description) for t in BOUND_TOOLS], sort_keys=True).encode("utf-8"),
+    digest_size=8,
+).hexdigest()
 
 
 def _is_capacity_or_rate_limit_error(exc: Exception) -> bool:
@@ -51,13 +130,41 @@ def _is_capacity_or_rate_limit_error(exc: Exception) -> bool:
     )
 
 
+def _invoke_model(model, messages: list, on_token: Callable[[str], None] | None = None):
+    """Invoke `model`, streaming text deltas to `on_token` when one is given."""
+    if on_token is None:
+        return model.invoke(messages)
+
+    full = None
+    for chunk in model.stream(messages):
+        full = chunk if full is None else full + chunk
+        if isinstance(chunk.content, str) and chunk.content:
+            on_token(chunk.content)
+    if full is None:
+        return AIMessage(content="")
+    return message_chunk_to_message(full)
+
+
 def invoke_with_resilience(messages: list, retries: int = 2):
     attempts = max(1, retries + 1)
     last_error: Exception | None = None
+    on_token = stream_callback()
+    emitted = False
+
+    def _relay(text: str) -> None:
+        nonlocal emitted
+        emitted = True
+        on_token(text)
+
+    def _attempt(model):
+        # Once a failed attempt has shown part of a reply, later attempts run
+        # without streaming so the UI never gets the same tokens twice; the
+        # front ends show the final reply from graph state instead.
+        return _invoke_model(model, messages, _relay if on_token is not None and not emitted else None)
 
     for attempt in range(attempts):
         try:
-            return LLM_WITH_TOOLS.invoke(messages)
+            return _attempt(_llm_with_tools())
         except Exception as exc:
             if not _is_capacity_or_rate_limit_error(exc):
                 raise
@@ -66,21 +173,103 @@ def invoke_with_resilience(messages: list, retries: int = 2):
                 wait = (2**attempt) + random.random()
                 time.sleep(wait)
 
-    if OLLAMA_WITH_TOOLS is not None:
-        return OLLAMA_WITH_TOOLS.invoke(messages)
+    fallback = _ollama_with_tools()
+    if fallback is not None:
+        return _attempt(fallback)
 
     if last_error is not None:
         raise last_error
     raise RuntimeError("Primary model failed and fallback model is unavailable.")
 
-def _current_datetime_context() -> str:
+
+def _response_cache_key(messages: list, scope: str = "") -> str:
+    # The local minute stands in for the per-second datetime context message:
+    # replies built from the clock ("what time is it", "in an hour") are only
+    # reused within the minute they were made. `scope` keeps threads apart.
+    _, now = _local_now()
+    payload = json.dumps(
+        [
+            MODEL_NAME,
+            _TOOL_SCHEMA_VERSION,
+            scope,
+            now.strftime("%Y-%m-%dT%H:%M"),
+            [(m.type, m.content, getattr(m, "tool_calls", None)) for m in messages],
+        ],
+        default=str,
+        sort_keys=True,
+    )
+    return hashlib.blake2b(payload.encode("utf-8")).hexdigest()
+
+
+def _replay(cached: AIMessage) -> AIMessage:
+    """Copy a cached response with a fresh message id and fresh tool-call ids."""
+    new_ids = {call.get("id"): f"call_{uuid.uuid4().hex}" for call in cached.tool_calls}
+    update: dict[str, Any] = {
+        # No id, so add_messages appends the clone instead of replacing an earlier turn.
+        "id": None,
+        "tool_calls": [{**call, "id": new_ids[call.get("id")]} for call in cached.tool_calls],
+    }
+    raw_calls = cached.additional_kwargs.get("tool_calls")
+    if raw_calls:
+        update["additional_kwargs"] = {
+            **cached.additional_kwargs,
+            "tool_calls": [{**raw, "id": new_ids.get(raw.get("id"), raw.get("id"))} for raw in raw_calls],
+        }
+    return cached.model_copy(update=update, deep=True)
+
+
+def _cached_invoke(messages: list, key_messages: list | None = None, scope: str = ""):
+    """Exact-match response cache in front of `invoke_with_resilience`.
+
+    `key_messages` is the stable part of the prompt to key on; per-call
+    context such as the datetime message is left out so repeats can hit.
+    `scope` (the graph thread id) keeps one chat's replies out of another's.
+    """
+    if not RESPONSE_CACHE_ENABLED:
+        return invoke_with_resilience(messages)
+
+    key = _response_cache_key(messages if key_messages is None else key_messages, scope)
+    cached = _RESPONSE_CACHE.get(key)
+    if cached is None:
+        cached = invoke_with_resilience(messages)
+        _RESPONSE_CACHE.set(key, cached)
+    return _replay(cached)
+
+
+# Byte-identical on every call so the provider can reuse its cached prompt
+# prefix; per-turn context goes in trailing messages instead.
+_SYSTEM_SYS = SystemMessage(
+    content=(
+        "You are a personal desktop assistant. "
+        "Speak clearly, simply, and concisely. "
+        "Keep answers short unless the user asks for details. "
+        "Never mention internal state, tools, or APIs in your final user-facing answer. "
+        "Resolve relative dates using the date/time context message at the end of the conversation."
+    )
+)
+
+# Prompt messages that never change; langchain does not mutate message objects,
+# so the same instances are reused on every turn.
+_FINAL_ANSWER_SYS = SystemMessage(
+    content="You already have enough information. Provide the final answer without calling any tools."
+)
+_INTENT_SYS = SystemMessage(
+    content=(
+        "Extract intent from the user's latest message and return compact JSON with keys: "
+        "intent, entities, urgency, needs_tool. No markdown."
+    )
+)
+
+def _local_zone(tz_name: str) -> tuple[str, tzinfo]:
+    zone = zone_for(tz_name)
+    if zone is timezone.utc:
+        return "UTC", zone
+    return tz_name, zone
+
+
+def _current_datetime_context(tz_name: str) -> str:
     now_utc = datetime.now(timezone.utc).replace(microsecond=0)
-    tz_name = effective_timezone_name()
-    try:
-        local_tz = ZoneInfo(tz_name)
-    except Exception:
-        tz_name = "UTC"
-        local_tz = timezone.utc
+    tz_name, local_tz = _local_zone(tz_name)
     now_local = now_utc.astimezone(local_tz)
     return (
         "Current date/time context for planning dates and times:\n"
@@ -91,14 +280,14 @@ def _current_datetime_context() -> str:
     )
 
 
-def _assistant_system_prompt() -> str:
-    return (
-        "You are a personal desktop assistant. "
-        "Speak clearly, simply, and concisely. "
-        "Keep answers short unless the user asks for details. "
-        "Never mention internal state, tools, or APIs in your final user-facing answer.\n\n"
-        f"{_current_datetime_context()}"
-    )
+@lru_cache(maxsize=4)
+def _datetime_message_for(second: int, tz_name: str) -> SystemMessage:
+    return SystemMessage(content=_current_datetime_context(tz_name))
+
+
+def _datetime_message() -> SystemMessage:
+    """Datetime context message, reused for calls within the same second."""
+    return _datetime_message_for(int(time.monotonic()), effective_timezone_name())
 
 
 def _safe_json_load(value: Any) -> Any:
@@ -107,32 +296,91 @@ def _safe_json_load(value: Any) -> Any:
     if not isinstance(value, str):
         return value
     text = value.strip()
-    if not text:
+    # Skip the raise/catch cost for plain-text tool output.
+    if text[:1] not in ("{", "[", '"'):
         return value
     try:
-        return json.loads(text)
-    except Exception:
+        return loads(text)
+    except ValueError:
         return value
 
 
+_JSON_FENCE = re.compile(r"^\s*```(?:json)?\s*\n?(.*?)\n?```\s*$", re.DOTALL | re.IGNORECASE)
+_JSON_OBJECT = re.compile(r"\{.*\}", re.DOTALL)
+
+
+def _parse_json_reply(text: Any) -> Any:
+    """Parse a model reply that should be JSON.
+
+    Tolerates a ```json fence and, failing that, prose around a single object.
+    """
+    if not isinstance(text, str):
+        return None
+    match = _JSON_FENCE.match(text)
+    payload = match.group(1) if match else text
+    try:
+        return loads(payload)
+    except ValueError:
+        pass
+    match = _JSON_OBJECT.search(payload)
+    if match is None:
+        return None
+    try:
+        return loads(match.group(0))
+    except ValueError:
+        return None
+
+
+def _content_kind(tool_name: str, status: str = "success") -> str:
+    if status == "error" or tool_name in TEXT_CONTENT_TOOLS:
+        return "text"
+    return "json"
+
+
+def _tool_message_content(msg: ToolMessage) -> Any:
+    kind = msg.additional_kwargs.get("content_kind")
+    if kind == "text":
+        return msg.content
+    if kind == "json" and isinstance(msg.content, str):
+        try:
+            return loads(msg.content)
+        except ValueError:
+            return msg.content
+    # Messages from the prebuilt ToolNode carry no kind; fall back to sniffing.
+    return _safe_json_load(msg.content)
+
+
 def _latest_tool_outputs(messages: list) -> list[dict[str, Any]]:
+    """Parse the trailing run of ToolMessages (stops at the first other message)."""
     outputs: list[dict[str, Any]] = []
     for msg in reversed(messages):
-        if isinstance(msg, ToolMessage):
-            outputs.append(
-                {
-                    "name": getattr(msg, "name", ""),
-                    "tool_call_id": getattr(msg, "tool_call_id", ""),
-                    "content": _safe_json_load(msg.content),
-                }
-            )
-            continue
-        if outputs:
+        if not isinstance(msg, ToolMessage):
             break
+        outputs.append(
+            {
+                "name": getattr(msg, "name", ""),
+                "tool_call_id": getattr(msg, "tool_call_id", ""),
+                "content": _tool_message_content(msg),
+            }
+        )
     outputs.reverse()
     return outputs
 
 
+def _tool_result_updates(outputs: list[dict[str, Any]]) -> AgentState:
+    updates: AgentState = {}
+    if not outputs:
+        return updates
+    updates["last_tool_result"] = outputs
+    for output in outputs:
+        if (
+            output.get("name") == "get_emails_tool"
+            and isinstance(output.get("content"), list)
+        ):
+            updates["last_email_results"] = output["content"]
+    return updates
+
+
 def _latest_ai_tool_calls(messages: list) -> list[dict[str, Any]]:
     for msg in reversed(messages):
         if isinstance(msg, AIMessage) and msg.tool_calls:
@@ -170,112 +418,281 @@ def _compact_runtime_messages(messages: list) -> list:
     return [messages[idx] for idx in selected_indices]
 
 
-def _extract_intent_with_ollama(runtime_messages: list) -> dict[str, Any] | None:
-    if OLLAMA_LLM is None or not runtime_messages:
-        return None
+def _trim_messages(messages: list, max_turns: int = 12) -> list:
+    """Keep the last `max_turns` human turns and everything after them.
 
-    latest_human = next((msg for msg in reversed(runtime_messages) if isinstance(msg, HumanMessage)), None)
-    if latest_human is None:
+    ToolMessages are kept only when the AIMessage that requested them is
+    kept too, so the window never opens on an orphaned tool result.
+    """
+    start = 0
+    turns = 0
+    for idx in range(len(messages) - 1, -1, -1):
+        if isinstance(messages[idx], HumanMessage):
+            turns += 1
+            start = idx
+            if turns >= max_turns:
+                break
+
+    window = messages[start:]
+    call_ids = {call.get("id") for msg in window if isinstance(msg, AIMessage) for call in msg.tool_calls}
+    return [msg for msg in window if not isinstance(msg, ToolMessage) or msg.tool_call_id in call_ids]
+
+
+def _extract_intent_with_ollama(latest_human: HumanMessage | None) -> dict[str, Any] | None:
+    ollama = _ollama_llm()
+    if ollama is None or latest_human is None:
         return None
 
     try:
-        intent_response = OLLAMA_LLM.invoke(
+        intent_response = ollama.invoke(
             [
-                SystemMessage(
-                    content=(
-                        "Extract intent from the user's latest message and return compact JSON with keys: "
-                        "intent, entities, urgency, needs_tool. No markdown."
-                    )
-                ),
+                _INTENT_SYS,
                 HumanMessage(content=str(latest_human.content)),
             ]
         )
-        parsed = _safe_json_load(intent_response.content)
+        parsed = _parse_json_reply(intent_response.content)
         return parsed if isinstance(parsed, dict) else None
     except Exception:
         return None
 
 
+def _scan_current_turn(messages: list) -> tuple[HumanMessage | None, bool]:
+    """Return the latest human message and whether any tool ran since it."""
+    used_tools = False
+    for idx in range(len(messages) - 1, -1, -1):
+        msg = messages[idx]
+        if isinstance(msg, HumanMessage):
+            return msg, used_tools
+        if isinstance(msg, ToolMessage) or (isinstance(msg, AIMessage) and msg.tool_calls):
+            used_tools = True
+    return None, used_tools
+
+
+# Answers to these drift with the clock, so they never go through the semantic cache.
+_TIME_SENSITIVE = re.compile(
+    r"\b(?:time|now|today|tonight|tomorrow|yesterday|date|day|week|month|year|current(?:ly)?|latest|ago|until|left)\b",
+    re.IGNORECASE,
+)
+
+
+def _thread_id(config: RunnableConfig | None) -> str:
+    return str(((config or {}).get("configurable") or {}).get("thread_id", ""))
+
+
+def _semantic_query(messages: list, latest_human: HumanMessage | None) -> str | None:
+    """The text a turn is looked up and stored under, or None to skip the cache.
+
+    Follow-ups ("translate that") depend on the previous answer, so it is part
+    of the key; a re-phrased question only hits after the same prior reply.
+    """
+    if latest_human is None or not isinstance(latest_human.content, str):
+        return None
+    text = latest_human.content.strip()
+    if not text or _TIME_SENSITIVE.search(text):
+        return None
+    seen_human = False
+    for msg in reversed(messages):
+        if msg is latest_human:
+            seen_human = True
+        elif seen_human and isinstance(msg, AIMessage) and not msg.tool_calls:
+            return f"{msg.content}\n\n{text}" if isinstance(msg.content, str) else None
+    return text
+
+
+def _remember_semantic_answer(scope: str, query: str | None, used_tools: bool, response: AIMessage) -> None:
+    # Only answers the model gave without tools are safe to replay: anything
+    # built from tool output (inbox, calendar, tasks, searches) goes stale, and
+    # guarded turns sent, created, or completed something.
+    if query is None or used_tools:
+        return
+    if not semantic_cache.is_enabled() or not isinstance(response.content, str):
+        return
+    semantic_cache.store(scope, query, response.content)
+
+
+def _respond_action() -> dict[str, Any]:
+    # A fresh dict per turn: state values must never share mutable objects.
+    return {"name": "respond", "args": {}}
+
+
+def _local_now() -> tuple[str, datetime]:
+    tz_name, local_tz = _local_zone(effective_timezone_name())
+    return tz_name, datetime.now(local_tz)
+
+
+def _answer_time() -> str:
+    tz_name, now = _local_now()
+    return f"It's {now.strftime('%I:%M %p').lstrip('0')} ({tz_name})."
+
+
+def _answer_date() -> str:
+    _, now = _local_now()
+    return f"Today is {now.strftime('%A, %B')} {now.day}, {now.year}."
+
+
+# Questions with a deterministic answer; matched against the whole message so
+# anything with extra context ("time in Tokyo", "time of my next meeting") still
+# goes to the LLM.
+_DIRECT_INTENTS = (
+    (re.compile(r"^\s*(what'?s|what is|what)?\s*(the\s+)?(current\s+)?time(\s+is\s+it)?(\s+now)?\s*\??\s*$", re.I), _answer_time),
+    (
+        re.compile(
+            r"^\s*((what'?s|what is)\s+(the\s+)?(date|day)(\s+today)?|what\s+day\s+is\s+(it|today)(\s+today)?)\s*\??\s*$",
+            re.I,
+        ),
+        _answer_date,
+    ),
+)
+
+
+@lru_cache(maxsize=256)
+def _match_direct_intent(text: str) -> Callable[[], str] | None:
+    for pattern, answer in _DIRECT_INTENTS:
+        if pattern.match(text):
+            return answer
+    return None
+
+
+def _direct_intent(messages: list) -> Callable[[], str] | None:
+    """The answer function for a deterministic question, without calling it.
+
+    The router only needs to know that a match exists; direct_responder builds
+    the answer once, and the regex match is reused between the two.
+    """
+    if not messages or not isinstance(messages[-1], HumanMessage):
+        return None
+    text = messages[-1].content
+    if not isinstance(text, str):
+        return None
+    return _match_direct_intent(text)
+
+
+@langsmith_traceable(name="direct_responder", run_type="chain")
+@timed("direct_responder")
+def direct_responder(state: AgentState, config: RunnableConfig = None) -> AgentState:
+    """Answer deterministic questions locally without calling the LLM."""
+    messages = state.get("messages", [])
+    answer = _direct_intent(messages)
+    return {
+        "messages": [AIMessage(content=answer() if answer is not None else "")],
+        "last_ai_idx": len(messages),
+        "approval_rejected": False,
+        "planned_action": _respond_action(),
+        "human_approved": None,
+    }
+
+
 @langsmith_traceable(name="assistant", run_type="chain")
 @timed("assistant")
-def assistant(state: AgentState) -> AgentState:
+def assistant(state: AgentState, config: RunnableConfig = None) -> AgentState:
     messages = state.get("messages", [])
-    runtime_messages = _compact_runtime_messages(messages)
-    intent_context = _extract_intent_with_ollama(runtime_messages)
+    latest_human, tools_in_turn = _scan_current_turn(messages)
+    semantic_scope = _thread_id(config)
+    semantic_query = _semantic_query(messages, latest_human) if semantic_cache.is_enabled() else None
+
+    if latest_human is not None and messages[-1] is latest_human:
+        cached_answer = semantic_cache.lookup(semantic_scope, semantic_query) if semantic_query else None
+        if cached_answer is not None:
+            return {
+                "messages": [AIMessage(content=cached_answer)],
+                "last_ai_idx": len(messages),
+                "approval_rejected": False,
+                "planned_action": _respond_action(),
+                "human_approved": None,
+            }
+
+    if HISTORY_TURNS:
+        runtime_messages = _trim_messages(messages, HISTORY_TURNS)
+    else:
+        runtime_messages = _compact_runtime_messages(messages)
 
     MAX_TOOL_CALLS = 3
     current_count = state.get("tool_call_count", 0)
-
-    system_prompt = _assistant_system_prompt()
-
-    if intent_context:
-        system_prompt = (
-            f"{system_prompt}\n\nParsed user intent: "
-            f"{json.dumps(intent_context, ensure_ascii=True)}"
-        )
-
-    model_messages = [SystemMessage(content=system_prompt), *runtime_messages]
+    intent_updates: AgentState = {}
 
     if current_count >= MAX_TOOL_CALLS:
-        final_messages = [
-            SystemMessage(
-                content="You already have enough information. "
-                        "Provide the final answer without calling any tools."
-            ),
-            *runtime_messages,
-        ]
-        response = LLM.invoke(final_messages)
+        final_messages = [_FINAL_ANSWER_SYS, *runtime_messages]
+        response = _invoke_model(_llm(), final_messages, stream_callback())
         tool_calls = []
     else:
-        response = invoke_with_resilience(model_messages)
+        # The intent only depends on the human message, so tool round-trips
+        # within the same turn reuse the one extracted for it.
+        latest_id = latest_human.id if latest_human is not None else None
+        if latest_id is not None and state.get("intent_for") == latest_id:
+            intent_context = state.get("intent_context")
+        else:
+            intent_context = _extract_intent_with_ollama(latest_human)
+            intent_updates = {"intent_context": intent_context, "intent_for": latest_id}
+
+        model_messages = [_SYSTEM_SYS, *runtime_messages, _datetime_message()]
+        if intent_context:
+            model_messages.append(
+                SystemMessage(content=f"Parsed user intent: {dumps(intent_context)}")
+            )
+        # The intent is derived from the conversation, so keying on the system
+        # prompt plus the conversation covers it.
+        response = _cached_invoke(
+            model_messages, key_messages=[_SYSTEM_SYS, *runtime_messages], scope=_thread_id(config)
+        )
         tool_calls = response.tool_calls or []
 
     new_count = current_count + len(tool_calls)
 
     updates: AgentState = {
         "messages": [response],
+        # The reply carries a fresh id, so add_messages appends it at this index.
+        "last_ai_idx": len(messages),
         "approval_rejected": False,
         "tool_call_count": new_count,
+        **intent_updates,
     }
 
     first_call = tool_calls[0] if tool_calls else None
 
     if first_call:
+        raw_args = first_call.get("args")
         updates["planned_action"] = {
             "name": str(first_call.get("name", "")),
-            "args": dict(first_call.get("args", {}) or {}),
+            # Copy so the planned action never aliases the AIMessage's tool call.
+            "args": dict(raw_args) if isinstance(raw_args, dict) else {},
         }
     else:
-        updates["planned_action"] = {"name": "respond", "args": {}}
+        updates["planned_action"] = _respond_action()
         updates["human_approved"] = None
+        _remember_semantic_answer(semantic_scope, semantic_query, tools_in_turn, response)
 
-    latest_outputs = _latest_tool_outputs(messages)
-    if latest_outputs:
-        updates["last_tool_result"] = latest_outputs
-        for output in latest_outputs:
-            if (
-                output.get("name") == "get_emails_tool"
-                and isinstance(output.get("content"), list)
-            ):
-                updates["last_email_results"] = output["content"]
+    # Nodes that emit ToolMessages record them as they go; only fall back to
+    # scanning when the trailing results were produced by the prebuilt ToolNode.
+    if messages and isinstance(messages[-1], ToolMessage):
+        recorded = state.get("last_tool_result") or []
+        if not recorded or recorded[-1].get("tool_call_id") != messages[-1].tool_call_id:
+            updates.update(_tool_result_updates(_latest_tool_outputs(messages)))
 
     return updates
 
 
 @langsmith_traceable(name="execute_action", run_type="chain")
 @timed("execute_action")
-def execute_action(state: AgentState) -> AgentState:
+def execute_action(state: AgentState, config: RunnableConfig = None) -> AgentState:
     messages = state.get("messages", [])
     tool_calls = _latest_ai_tool_calls(messages)
     if not tool_calls:
-        return {"approval_rejected": False}
+        return {"approval_rejected": False, "tools_executed": False}
 
     guarded_present = any(str(call.get("name", "")) in GUARDED_ACTIONS for call in tool_calls)
     if not guarded_present:
-        return {"approval_rejected": False}
+        # Read-only calls need no approval, so run them here concurrently
+        # instead of handing them to the serial tools node.
+        results = _run_tool_calls_parallel(tool_calls, state, config)
+        return {
+            "messages": results,
+            "approval_rejected": False,
+            "tools_executed": True,
+            **_tool_result_updates(_latest_tool_outputs(results)),
+        }
 
     if state.get("human_approved") is True:
-        return {"approval_rejected": False}
+        return {"approval_rejected": False, "tools_executed": False}
 
     approval_error = "Action not approved." if state.get("human_approved") is False else "Action requires approval."
     blocked_messages: list[ToolMessage] = []
@@ -285,6 +702,7 @@ def execute_action(state: AgentState) -> AgentState:
                 content=approval_error,
                 tool_call_id=str(call.get("id", "")),
                 name=str(call.get("name", "")),
+                additional_kwargs={"content_kind": "text"},
             )
         )
 
@@ -292,9 +710,69 @@ def execute_action(state: AgentState) -> AgentState:
         "messages": blocked_messages,
         "approval_rejected": True,
         "human_approved": None,
+        "tools_executed": False,
+        **_tool_result_updates(_latest_tool_outputs(blocked_messages)),
+    }
+
+
+@lru_cache(maxsize=None)
+def _accepts_state(tool_name: str) -> bool:
+    """Whether the tool declares an injected `state` argument."""
+    func = getattr(TOOL_BY_NAME[tool_name], "func", None)
+    return func is not None and "state" in inspect.signature(func).parameters
+
+
+def _run_tool_call(call: dict[str, Any], state: AgentState, config: RunnableConfig | None) -> ToolMessage:
+    name = str(call.get("name", ""))
+    args = dict(call.get("args", {}) or {})
+    status = "success"
+    try:
+        if name not in TOOL_BY_NAME:
+            raise ValueError(f"{name} is not a valid tool, try one of [{', '.join(TOOL_BY_NAME)}].")
+        if _accepts_state(name):
+            args["state"] = state
+        content = to_tool_content(TOOL_BY_NAME[name].invoke(args, config=config))
+    except Exception as exc:
+        content, status = f"Error: {exc!r}\n Please fix your mistakes.", "error"
+    return ToolMessage(
+        content=content,
+        tool_call_id=str(call.get("id", "")),
+        name=name,
+        status=status,
+        additional_kwargs={"content_kind": _content_kind(name, status)},
+    )
+
+
+def _run_tool_calls_parallel(
+    tool_calls: list[dict[str, Any]], state: AgentState, config: RunnableConfig | None
+) -> list[ToolMessage]:
+    if len(tool_calls) == 1:
+        return [_run_tool_call(tool_calls[0], state, config)]
+    futures = [_TOOL_EXECUTOR.submit(_run_tool_call, call, state, config) for call in tool_calls]
+    return [future.result() for future in futures]
+
+
+@langsmith_traceable(name="run_tools", run_type="chain")
+@timed("run_tools")
+def run_tools(state: AgentState, config: RunnableConfig = None) -> AgentState:
+    """Run the latest tool calls in-process, injecting graph state where declared.
+
+    Stands in for the prebuilt ToolNode outside a compiled graph, where
+    ToolNode has no Runnable config to read from.
+    """
+    results = [_run_tool_call(call, state, config) for call in _latest_ai_tool_calls(state.get("messages", []))]
+    return {
+        "messages": results,
+        **_tool_result_updates(_latest_tool_outputs(results)),
     }
 
 
+def route_from_start(state: AgentState) -> Literal["direct_responder", "assistant"]:
+    if _direct_intent(state.get("messages", [])) is not None:
+        return "direct_responder"
+    return "assistant"
+
+
 def route_after_assistant(state: AgentState) -> Literal["execute_action", "end"]:
     messages = state.get("messages", [])
     if not messages:
@@ -306,6 +784,6 @@ def route_after_assistant(state: AgentState) -> Literal["execute_action", "end"]
 
 
 def route_after_execute(state: AgentState) -> Literal["tools", "assistant"]:
-    if state.get("approval_rejected"):
+    if state.get("approval_rejected") or state.get("tools_executed"):
         return "assistant"
     return "tools"
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from functools import lru_cache
+
+from dotenv import load_dotenv
+
+try:
+    import numpy as np
+    from sentence_transformers import SentenceTransformer
+except Exception:  # pragma: no cover - optional dependency
+    np = None
+    SentenceTransformer = None
+
+from app.env import env_float, env_true
+
+load_dotenv()
+
+SEMANTIC_CACHE_ENABLED = env_true("AGENT_SEMANTIC_CACHE")
+SEMANTIC_CACHE_THRESHOLD = env_float("AGENT_SEMANTIC_CACHE_THRESHOLD", 0.92)
+SEMANTIC_CACHE_TTL = env_float("AGENT_SEMANTIC_CACHE_TTL", 300.0, minimum=0.0)
+SEMANTIC_CACHE_MODEL = os.getenv("AGENT_SEMANTIC_CACHE_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+_MAX_ENTRIES = 256
+
+_lock = threading.Lock()
+_matrix = None
+_answers: list[str] = []
+_expires: list[float] = []
+# Entries only match within the conversation (graph thread) that stored them.
+_scopes: list[str] = []
+
+
+def is_enabled() -> bool:
+    return SEMANTIC_CACHE_ENABLED and SentenceTransformer is not None
+
+
+@lru_cache(maxsize=1)
+def _model():
+    return SentenceTransformer(SEMANTIC_CACHE_MODEL)
+
+
+def _embed(text: str):
+    return _model().encode([text], normalize_embeddings=True)[0].astype(np.float32)
+
+
+def lookup(scope: str, text: str) -> str | None:
+    """Return a cached answer for a semantically equivalent request in `scope`, if any."""
+    if not is_enabled() or not text.strip():
+        return None
+    with _lock:
+        if _matrix is None:
+            return None
+    vector = _embed(text)
+    with _lock:
+        if _matrix is None:
+            return None
+        # Rows are unit vectors, so the dot product is the cosine similarity.
+        in_scope = np.fromiter((entry_scope == scope for entry_scope in _scopes), dtype=bool, count=len(_scopes))
+        scores = np.where(in_scope, _matrix @ vector, -1.0)
+        best = int(np.argmax(scores))
+        if scores[best] < SEMANTIC_CACHE_THRESHOLD or _expires[best] <= time.monotonic():
+            return None
+        return _answers[best]
+
+
+def store(scope: str, text: str, answer: str) -> None:
+    global _matrix
+    if not is_enabled() or not text.strip() or not answer.strip():
+        return
+    vector = _embed(text)
+    with _lock:
+        now = time.monotonic()
+        keep = [idx for idx, expires_at in enumerate(_expires) if expires_at > now][-(_MAX_ENTRIES - 1):]
+        rows = [_matrix[idx] for idx in keep] if _matrix is not None else []
+        _answers[:] = [_answers[idx] for idx in keep] + [answer]
+        _expires[:] = [_expires[idx] for idx in keep] + [now + SEMANTIC_CACHE_TTL]
+        _scopes[:] = [_scopes[idx] for idx in keep] + [scope]
+        _matrix = np.vstack([*rows, vector])
+
+
+__all__ = ["is_enabled", "lookup", "store"]
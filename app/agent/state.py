@@ -21,4 +21,12 @@ class AgentState(TypedDict, total=False):
     approval_rejected: bool
     last_email_results: list[dict[str, Any]]
     last_tool_result: list[dict[str, Any]]
-    tool_call_count: int
\ No newline at end of file
+    tool_call_count: int
+    # Set when execute_action ran a read-only batch itself, skipping `tools`.
+    tools_executed: bool
+    # Ollama intent for the human message whose id is `intent_for`.
+    intent_context: dict[str, Any] | None
+    intent_for: str | None
+    # Index in `messages` of the latest AIMessage, so callers can read the
+    # reply without scanning the history.
+    last_ai_idx: int
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator
+
+_STREAM_CALLBACK: ContextVar[Callable[[str], None] | None] = ContextVar("stream_callback", default=None)
+
+
+@contextmanager
+def stream_to(callback: Callable[[str], None]) -> Iterator[None]:
+    """Forward model text deltas produced inside this block to `callback`."""
+    token = _STREAM_CALLBACK.set(callback)
+    try:
+        yield
+    finally:
+        _STREAM_CALLBACK.reset(token)
+
+
+def stream_callback() -> Callable[[str], None] | None:
+    return _STREAM_CALLBACK.get()
+
+
+__all__ = ["stream_callback", "stream_to"]
@@ -1,3 +1,5 @@
+from dotenv import load_dotenv
+
 from app.agent.tools import (
     add_event_tool,
     add_task_tool,
@@ -10,14 +12,24 @@ from app.agent.tools import (
     send_email_tool,
     web_search_tool,
 )
+from app.env import env_true
+
+load_dotenv()
+
+COMPACT_TOOL_DESCRIPTIONS = env_true("AGENT_COMPACT_TOOL_DESCRIPTIONS")
 
 # Any tool in this set requires explicit approval in the approval gate node.
-GUARDED_ACTIONS = {
+GUARDED_ACTIONS = frozenset({
     "send_email_tool",
     "add_event_tool",
     "add_task_tool",
     "complete_task_tool",
-}
+})
+
+# Tools that return plain text; every other tool returns JSON via to_tool_content.
+TEXT_CONTENT_TOOLS = frozenset({
+    "get_current_time_iso_tool",
+})
 
 TOOLS = [
     get_emails_tool,
@@ -32,4 +44,34 @@ TOOLS = [
     complete_task_tool,
 ]
 
-__all__ = ["GUARDED_ACTIONS", "TOOLS"]
+TOOL_BY_NAME = {t.name: t for t in TOOLS}
+
+# Docstring sections that only help the model pick a tool; the argument,
+# "What not to do", and safety sections carry constraints and are always kept.
+_SELECTION_ONLY_SECTIONS = frozenset({"use when:"})
+
+
+def _compact_description(description: str) -> str:
+    """Drop blank lines and selection-only sections; keep every constraint line."""
+    kept: list[str] = []
+    skipping = False
+    for raw in description.splitlines():
+        line = raw.strip()
+        if not line:
+            continue
+        if line.endswith(":") and not line.startswith("-"):
+            skipping = line.lower() in _SELECTION_ONLY_SECTIONS
+        if not skipping:
+            kept.append(line)
+    return "\n".join(kept) or description
+
+
+# What bind_tools sends to the model. Compaction works on copies so the shared
+# tool objects keep their full docstrings.
+BOUND_TOOLS = (
+    [t.model_copy(update={"description": _compact_description(t.description)}) for t in TOOLS]
+    if COMPACT_TOOL_DESCRIPTIONS
+    else TOOLS
+)
+
+__all__ = ["BOUND_TOOLS", "GUARDED_ACTIONS", "TEXT_CONTENT_TOOLS", "TOOLS", "TOOL_BY_NAME"]
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+import re
+import time
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Annotated, Any
 
 from langchain_core.tools import tool
@@ -11,36 +14,55 @@ from app.agent.tools.common import as_positive_int, require_human_approval, to_t
 from app.tools.calendar import add_event, effective_timezone_name, list_events
 
 
+_UTC_SUFFIX = re.compile(r"(?:Z|[+-]00:?00)$", re.IGNORECASE)
+
+
 def _normalize_add_event_args(raw_args: dict[str, Any]) -> dict[str, Any]:
-    """Normalize UTC-marked local wall times into calendar-local times."""
-    args = dict(raw_args or {})
-    tz_name = effective_timezone_name()
-    if tz_name.upper() == "UTC":
-        return args
+    """Normalize UTC-marked local wall times into calendar-local times.
 
+    Returns `raw_args` itself when nothing needs rewriting; copies only on change.
+    """
+    raw_args = raw_args or {}
+    if effective_timezone_name().upper() == "UTC":
+        return raw_args
+
+    args: dict[str, Any] | None = None
     for key in ("start_iso", "end_iso"):
-        value = args.get(key)
+        value = raw_args.get(key)
         if not isinstance(value, str):
             continue
         text = value.strip()
-        if not text:
+        # Only a zero UTC offset is rewritten; the suffix check skips parsing
+        # everything else. Invalid values are left for add_event to reject.
+        if not _UTC_SUFFIX.search(text):
             continue
         try:
             parsed = datetime.fromisoformat(text.replace("Z", "+00:00"))
         except ValueError:
             continue
+        if parsed.utcoffset() != timedelta(0):
+            continue
+        if args is None:
+            args = dict(raw_args)
+        args[key] = parsed.replace(tzinfo=None).isoformat(timespec="seconds")
+    return args if args is not None else raw_args
 
-        if parsed.tzinfo is not None and parsed.utcoffset() == timedelta(0):
-            args[key] = parsed.replace(tzinfo=None).isoformat(timespec="seconds")
-    return args
 
+_RANGE_BUCKET_SECONDS = 30
 
-def _default_calendar_range(days_ahead: int = 7) -> tuple[str, str]:
+
+@lru_cache(maxsize=4)
+def _calendar_range_for(bucket: int, days_ahead: int) -> tuple[str, str]:
     now = datetime.now(timezone.utc).replace(microsecond=0)
     end = now + timedelta(days=days_ahead)
     return now.isoformat().replace("+00:00", "Z"), end.isoformat().replace("+00:00", "Z")
 
 
+def _default_calendar_range(days_ahead: int = 7) -> tuple[str, str]:
+    """Now through `days_ahead` days, reused for up to 30 seconds."""
+    return _calendar_range_for(int(time.monotonic() // _RANGE_BUCKET_SECONDS), days_ahead)
+
+
 @tool
 def list_events_tool(time_min: str = "", time_max: str = "", max_results: int = 10) -> str:
     """List calendar events inside a date range.
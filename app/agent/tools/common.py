@@ -1,9 +1,9 @@
 from __future__ import annotations
 
-import json
 from typing import Any
 
 from app.agent.state import AgentState
+from app.serialization import dumps
 
 
 def as_positive_int(value: Any, default: int, *, min_value: int = 1, max_value: int = 50) -> int:
@@ -23,4 +23,4 @@ def to_tool_content(value: Any) -> str:
     """Convert tool output into LLM-safe content."""
     if isinstance(value, str):
         return value
-    return json.dumps(value, ensure_ascii=False, default=str)
+    return dumps(value)
@@ -11,7 +11,7 @@ from app.tools.gmail import get_emails, send_email
 
 
 @tool
-def get_emails_tool(query: str = "", max_results: int = 5) -> str:
+def get_emails_tool(query: str = "", max_results: int = 5, include_body: bool = True) -> str:
     """Read inbox emails with deterministic query handling.
 
     Use when:
@@ -20,6 +20,7 @@ def get_emails_tool(query: str = "", max_results: int = 5) -> str:
     What arguments it expects:
     - query: Gmail query string.
     - max_results: number of emails to return (1..25).
+    - include_body: set false to list senders/subjects/dates without message bodies.
 
     What not to do:
     - Do not use this to send or change emails.
@@ -30,7 +31,11 @@ def get_emails_tool(query: str = "", max_results: int = 5) -> str:
     base_query = "in:inbox category:primary"
     user_query = str(query or "").strip()
     final_query = f"{base_query} {user_query}".strip()
-    result = get_emails(query=final_query, max_results=as_positive_int(max_results, 5, max_value=25))
+    result = get_emails(
+        query=final_query,
+        max_results=as_positive_int(max_results, 5, max_value=25),
+        include_body=include_body is not False,
+    )
     return to_tool_content(result)
 
 
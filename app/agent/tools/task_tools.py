@@ -1,13 +1,13 @@
 from __future__ import annotations
 
-from typing import Annotated, Any
+from typing import Annotated, Any, NamedTuple
 
 from langchain_core.tools import tool
 from langgraph.prebuilt import InjectedState
 
 from app.agent.state import AgentState
 from app.agent.tools.common import as_positive_int, require_human_approval, to_tool_content
-from app.tools.tasks import add_task, complete_task, list_tasks
+from app.tools.tasks import add_tasks, complete_task, list_tasks
 
 
 def _normalize_identifiers(value: str | list[str] | None) -> list[str]:
@@ -20,33 +20,53 @@ def _normalize_identifiers(value: str | list[str] | None) -> list[str]:
         if "," in text:
             return [part.strip() for part in text.split(",") if part.strip()]
         return [text]
-    return [str(item).strip() for item in value if str(item).strip()]
+    stripped = (str(item).strip() for item in value)
+    return [item for item in stripped if item]
 
 
-def _resolve_task_identifier(identifier: str, open_tasks: list[dict[str, Any]]) -> tuple[str | None, str | None]:
-    """Return (task_id, ambiguity_marker)."""
+class _TaskIndex(NamedTuple):
+    ids: dict[str, str]
+    exact_titles: dict[str, list[str]]
+    titles: list[tuple[str, str]]
+
+
+def _build_task_index(open_tasks: list[dict[str, Any]]) -> _TaskIndex:
+    """Lower ids/titles once per call and index them for O(1) exact lookups."""
+    ids: dict[str, str] = {}
+    exact_titles: dict[str, list[str]] = {}
+    titles: list[tuple[str, str]] = []
+    for task in open_tasks:
+        task_id = str(task.get("id", ""))
+        title_key = str(task.get("title", "")).strip().lower()
+        ids.setdefault(task_id.strip().lower(), task_id)
+        exact_titles.setdefault(title_key, []).append(task_id)
+        titles.append((task_id, title_key))
+    return _TaskIndex(ids=ids, exact_titles=exact_titles, titles=titles)
+
+
+def _resolve_task_identifier(identifier: str, index: _TaskIndex) -> tuple[str | None, str | None]:
+    """Return (task_id, ambiguity_marker).
+
+    An id match wins, then a unique exact title, then a unique substring match.
+    """
     key = identifier.strip().lower()
     if not key:
         return None, ""
 
-    for task in open_tasks:
-        if str(task.get("id", "")).strip().lower() == key:
-            return str(task.get("id", "")), None
-
-    exact_title_matches = [
-        task for task in open_tasks if str(task.get("title", "")).strip().lower() == key
-    ]
-    if len(exact_title_matches) == 1:
-        return str(exact_title_matches[0].get("id", "")), None
-    if len(exact_title_matches) > 1:
+    task_id = index.ids.get(key)
+    if task_id is not None:
+        return task_id, None
+
+    exact_title_ids = index.exact_titles.get(key, [])
+    if len(exact_title_ids) == 1:
+        return exact_title_ids[0], None
+    if len(exact_title_ids) > 1:
         return None, identifier
 
-    contains_matches = [
-        task for task in open_tasks if key in str(task.get("title", "")).strip().lower()
-    ]
-    if len(contains_matches) == 1:
-        return str(contains_matches[0].get("id", "")), None
-    if len(contains_matches) > 1:
+    contains_ids = [task_id for task_id, title_key in index.titles if key in title_key]
+    if len(contains_ids) == 1:
+        return contains_ids[0], None
+    if len(contains_ids) > 1:
         return None, identifier
 
     return None, None
@@ -80,24 +100,31 @@ def add_task_tool(
     if not titles:
         raise ValueError("Missing required field: titles")
 
+    clean_titles = [str(raw_title or "").strip() for raw_title in titles]
+    non_empty = [title for title in clean_titles if title]
+    outcomes: list[dict[str, Any] | Exception] = []
+    if non_empty:
+        # One batch request creates every task; a bad shared argument (e.g.
+        # due_iso) fails them all, as it would have one by one.
+        try:
+            outcomes = add_tasks(non_empty, notes=str(notes or ""), due_iso=str(due_iso or "").strip())
+        except Exception as e:
+            outcomes = [e] * len(non_empty)
+    pending_outcomes = iter(outcomes)
+
     created = []
     errors = []
 
-    for raw_title in titles:
-        clean_title = str(raw_title or "").strip()
+    for clean_title in clean_titles:
         if not clean_title:
             errors.append("Empty title skipped")
             continue
 
-        try:
-            add_task(
-                title=clean_title,
-                notes=str(notes or ""),
-                due_iso=str(due_iso or "").strip(),
-            )
+        outcome = next(pending_outcomes)
+        if isinstance(outcome, Exception):
+            errors.append({clean_title: str(outcome)})
+        else:
             created.append(clean_title)
-        except Exception as e:
-            errors.append({clean_title: str(e)})
 
     return to_tool_content({"created": created, "errors": errors})
 
@@ -152,20 +179,18 @@ def complete_task_tool(
     """
     require_human_approval(state)
 
-    open_tasks = list_tasks(max_results=100)
+    # Resolution only needs ids and titles; skip notes, links, and due dates.
+    open_tasks = list_tasks(max_results=100, fields="id,title")
     if not open_tasks:
         return to_tool_content(
             {"completed": [], "count": 0, "not_found": [], "ambiguous": [], "message": "No open tasks."}
         )
 
     if complete_all:
-        completed_titles: list[str] = []
-        for task in open_tasks:
-            task_id = str(task.get("id", "")).strip()
-            if not task_id:
-                continue
-            complete_task(task_ids=[task_id])
-            completed_titles.append(str(task.get("title", "")))
+        completable = [task for task in open_tasks if str(task.get("id", "")).strip()]
+        if completable:
+            complete_task(task_ids=[str(task.get("id", "")).strip() for task in completable])
+        completed_titles = [str(task.get("title", "")) for task in completable]
         return to_tool_content({
             "completed": completed_titles,
             "count": len(completed_titles),
@@ -182,8 +207,9 @@ def complete_task_tool(
     ambiguous: list[str] = []
     completed_titles: list[str] = []
 
+    index = _build_task_index(open_tasks)
     for raw_identifier in identifiers:
-        task_id, maybe_ambiguous = _resolve_task_identifier(raw_identifier, open_tasks)
+        task_id, maybe_ambiguous = _resolve_task_identifier(raw_identifier, index)
         if task_id:
             resolved_ids.append(task_id)
             continue
@@ -192,9 +218,13 @@ def complete_task_tool(
         else:
             ambiguous.append(raw_identifier)
 
-    for task_id in resolved_ids:
-        complete_task(task_ids=[task_id])
-        match = next((task for task in open_tasks if str(task.get("id", "")) == task_id), None)
+    by_id = {str(task.get("id", "")): task for task in open_tasks}
+    # Several identifiers can resolve to the same task; complete it once.
+    unique_ids = list(dict.fromkeys(resolved_ids))
+    if unique_ids:
+        complete_task(task_ids=unique_ids)
+    for task_id in unique_ids:
+        match = by_id.get(task_id)
         if match:
             completed_titles.append(str(match.get("title", "")))
 
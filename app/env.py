@@ -0,0 +1,42 @@
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+_TRUTHY = frozenset({"1", "true", "yes", "on"})
+
+
+def env_true(name: str, default: bool = False) -> bool:
+    """Read a boolean flag; unset or empty falls back to `default`."""
+    raw = os.getenv(name, "").strip().lower()
+    if not raw:
+        return default
+    return raw in _TRUTHY
+
+
+def _env_number(name: str, default, parse, minimum):
+    raw = os.getenv(name, "").strip()
+    if not raw:
+        return default
+    try:
+        value = parse(raw)
+    except ValueError:
+        logger.warning("Ignoring invalid %s=%r; using %s", name, raw, default)
+        return default
+    if minimum is not None and value < minimum:
+        logger.warning("Ignoring %s=%r below %s; using %s", name, raw, minimum, default)
+        return default
+    return value
+
+
+def env_int(name: str, default: int, minimum: int | None = None) -> int:
+    """Read an integer setting, logging and falling back to `default` when it is invalid."""
+    return _env_number(name, default, int, minimum)
+
+
+def env_float(name: str, default: float, minimum: float | None = None) -> float:
+    """Read a float setting, logging and falling back to `default` when it is invalid."""
+    return _env_number(name, default, float, minimum)
+
+
+__all__ = ["env_float", "env_int", "env_true"]
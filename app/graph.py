@@ -1,36 +1,175 @@
+import os
+import sqlite3
+import threading
+from functools import cache
+from typing import Any, Literal, NamedTuple
+
 from langgraph.checkpoint.memory import MemorySaver
 from langgraph.graph import END, START, StateGraph
+from langgraph.graph.message import add_messages
 from langgraph.prebuilt import ToolNode
 
-from app.agent.runtime import assistant, execute_action, route_after_assistant, route_after_execute
+from app.agent.runtime import (
+    assistant,
+    direct_responder,
+    execute_action,
+    prewarm_llm_connection,
+    route_after_assistant,
+    route_after_execute,
+    route_from_start,
+    run_tools,
+)
 from app.agent.state import AgentState
 from app.agent.tooling import GUARDED_ACTIONS, TOOLS
 
 
+# SQLite file for durable checkpoints; empty keeps them in memory.
+CHECKPOINT_DB = os.getenv("AGENT_CHECKPOINT_DB", "").strip()
+
+
 def _build_checkpointer(sqlite_path: str | None = None):
+    sqlite_path = sqlite_path or CHECKPOINT_DB
     if sqlite_path:
         try:
             from langgraph.checkpoint.sqlite import SqliteSaver
 
-            return SqliteSaver.from_conn_string(sqlite_path)
+            # `from_conn_string` is a context manager in current releases and
+            # would close the connection on return; keep our own open instead.
+            # Graph turns run on worker threads, so the connection is shared.
+            conn = sqlite3.connect(sqlite_path, check_same_thread=False)
+            return SqliteSaver(conn)
         except Exception:
             pass
     return MemorySaver()
 
 
-def build_graph(sqlite_path: str | None = None):
+def _after_assistant(values: dict[str, Any]) -> str | None:
+    return "execute_action" if route_after_assistant(values) == "execute_action" else None
+
+
+# Node name -> router returning the next node, or None at END.
+_ROUTES = {
+    "assistant": _after_assistant,
+    "execute_action": route_after_execute,
+    "tools": lambda values: "assistant",
+    "direct_responder": lambda values: None,
+}
+
+
+class FlatSnapshot(NamedTuple):
+    values: dict[str, Any]
+    next: tuple[str, ...]
+
+
+class FlatGraph:
+    """The assistant topology specialized into plain function calls.
+
+    Mirrors the subset of the compiled-graph API the interfaces use
+    (`invoke`, `get_state`, `update_state`) and keeps the
+    `interrupt_before=["execute_action"]` pause. Thread state is held in
+    process memory.
+    """
+
+    def __init__(self, interrupt_before: tuple[str, ...] = ("execute_action",)) -> None:
+        self._interrupt_before = frozenset(interrupt_before)
+        self._threads: dict[str, FlatSnapshot] = {}
+        self._lock = threading.Lock()
+        # Node name -> callable, resolved once instead of an if/elif chain per step.
+        self._nodes = {
+            "assistant": assistant,
+            "execute_action": execute_action,
+            # ToolNode needs a compiled graph's config; run the calls directly.
+            "tools": run_tools,
+            "direct_responder": direct_responder,
+        }
+
+    @staticmethod
+    def _thread_id(config: dict | None) -> str:
+        return str(((config or {}).get("configurable") or {}).get("thread_id", ""))
+
+    @staticmethod
+    def _merge(values: dict[str, Any], update: dict[str, Any] | None) -> None:
+        for key, value in (update or {}).items():
+            if key == "messages":
+                values["messages"] = add_messages(values.get("messages", []), value)
+            else:
+                values[key] = value
+
+    def get_state(self, config: dict) -> FlatSnapshot:
+        with self._lock:
+            return self._threads.get(self._thread_id(config), FlatSnapshot({}, ()))
+
+    def update_state(self, config: dict, values: dict[str, Any], as_node: str | None = None) -> None:
+        thread_id = self._thread_id(config)
+        with self._lock:
+            snapshot = self._threads.get(thread_id, FlatSnapshot({}, ()))
+            merged = dict(snapshot.values)
+            self._merge(merged, values)
+            self._threads[thread_id] = FlatSnapshot(merged, snapshot.next)
+
+    def invoke(self, graph_input: dict[str, Any] | None, config: dict | None = None, **_: Any) -> dict[str, Any]:
+        thread_id = self._thread_id(config)
+        snapshot = self.get_state(config)
+        values = dict(snapshot.values)
+
+        if graph_input is not None:
+            self._merge(values, graph_input)
+            node: str | None = route_from_start(values)
+            resuming = False
+        elif snapshot.next:
+            node = snapshot.next[0]
+            resuming = True
+        else:
+            return values
+
+        pending: tuple[str, ...] = ()
+        while node is not None:
+            if node in self._interrupt_before and not resuming:
+                pending = (node,)
+                break
+            resuming = False
+            self._merge(values, self._nodes[node](values, config))
+            node = _ROUTES[node](values)
+
+        with self._lock:
+            self._threads[thread_id] = FlatSnapshot(values, pending)
+        return values
+
+
+def build_graph(sqlite_path: str | None = None, compile_mode: Literal["graph", "aot"] = "graph"):
     """Build hybrid assistant graph.
 
     Flow:
     START -> assistant -> execute_action -> tools -> assistant -> END
+
+    Questions with a deterministic answer (current time/date) go
+    START -> direct_responder -> END without an LLM call.
+
+    Read-only tool batches skip `tools`: execute_action runs them
+    concurrently and routes straight back to `assistant`.
+
+    `compile_mode="aot"` returns a `FlatGraph` that runs the same nodes and
+    routers as direct calls, without the StateGraph interpreter. It keeps
+    thread state in memory, so `sqlite_path` is ignored in that mode.
     """
+    prewarm_llm_connection()
+
+    if compile_mode == "aot":
+        return FlatGraph(interrupt_before=("execute_action",))
+
     builder = StateGraph(AgentState)
 
     builder.add_node("assistant", assistant)
     builder.add_node("execute_action", execute_action)
     builder.add_node("tools", ToolNode(TOOLS))
+    builder.add_node("direct_responder", direct_responder)
 
-    builder.add_edge(START, "assistant")
+    builder.add_conditional_edges(
+        START,
+        route_from_start,
+        {"direct_responder": "direct_responder", "assistant": "assistant"},
+    )
+    builder.add_edge("direct_responder", END)
     builder.add_conditional_edges(
         "assistant",
         route_after_assistant,
@@ -49,4 +188,14 @@ def build_graph(sqlite_path: str | None = None):
     )
 
 
-__all__ = ["build_graph", "GUARDED_ACTIONS"]
+@cache
+def get_app():
+    """Process-wide graph shared by every front end (CLI, Streamlit, Telegram).
+
+    One instance means one LLM client pool, one tool registry, and one
+    checkpointer connection per process.
+    """
+    return build_graph()
+
+
+__all__ = ["FlatGraph", "build_graph", "get_app", "GUARDED_ACTIONS"]
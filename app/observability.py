@@ -1,17 +1,45 @@
-import os
+import atexit
+import logging
+import queue
+import sys
 import time
 from contextlib import contextmanager
+from logging.handlers import QueueHandler, QueueListener
 from functools import wraps
 from typing import Any, Callable
 
+from dotenv import load_dotenv
+
+from app.env import env_true
+
 try:
     from langsmith import traceable as _langsmith_traceable
 except Exception:
     _langsmith_traceable = None
 
 
-def _env_true(name: str, default: str = "false") -> bool:
-    return os.getenv(name, default).strip().lower() in {"1", "true", "yes", "on"}
+load_dotenv()
+
+
+# Read once: decorators are applied at import time and the flag never changes
+# for the life of the process.
+TIMING_ENABLED = env_true("ENABLE_TIME_TRACKING", True)
+
+# Traced calls only enqueue their timing line; a listener thread writes it to
+# stdout as soon as it arrives, so no traced call blocks on a console write
+# and long-running processes (the Telegram bot) still log in real time.
+_console = logging.StreamHandler(sys.stdout)
+_console.setFormatter(logging.Formatter("[timing] %(message)s"))
+_timing_queue: queue.SimpleQueue = queue.SimpleQueue()
+_timing_listener = QueueListener(_timing_queue, _console)
+_timing_log = logging.getLogger("timing")
+_timing_log.addHandler(QueueHandler(_timing_queue))
+_timing_log.setLevel(logging.INFO)
+_timing_log.propagate = False
+if TIMING_ENABLED:
+    _timing_listener.start()
+    # Drains whatever is still queued before the interpreter exits.
+    atexit.register(_timing_listener.stop)
 
 
 def langsmith_traceable(
@@ -28,19 +56,19 @@ def langsmith_traceable(
 
 def timed(name: str | None = None) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
     def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        if not TIMING_ENABLED:
+            return func
+
         label = name or func.__name__
 
         @wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
-            if not _env_true("ENABLE_TIME_TRACKING", "true"):
-                return func(*args, **kwargs)
-
             started = time.perf_counter()
             try:
                 return func(*args, **kwargs)
             finally:
                 elapsed_ms = (time.perf_counter() - started) * 1000.0
-                print(f"[timing] {label}: {elapsed_ms:.2f} ms")
+                _timing_log.info("%s: %.2f ms", label, elapsed_ms)
 
         return wrapper
 
@@ -49,7 +77,7 @@ def timed(name: str | None = None) -> Callable[[Callable[..., Any]], Callable[..
 
 @contextmanager
 def timed_block(name: str):
-    if not _env_true("ENABLE_TIME_TRACKING", "true"):
+    if not TIMING_ENABLED:
         yield
         return
 
@@ -58,4 +86,4 @@ def timed_block(name: str):
         yield
     finally:
         elapsed_ms = (time.perf_counter() - started) * 1000.0
-        print(f"[timing] {name}: {elapsed_ms:.2f} ms")
+        _timing_log.info("%s: %.2f ms", name, elapsed_ms)
@@ -0,0 +1,28 @@
+import json
+from typing import Any
+
+try:
+    import orjson
+except Exception:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def dumps(value: Any) -> str:
+    """Serialize to a compact UTF-8 JSON string; unknown types fall back to `str`."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        except TypeError:
+            # e.g. integers wider than 64 bits; stdlib handles those.
+            pass
+    return json.dumps(value, ensure_ascii=False, default=str)
+
+
+def loads(text: str | bytes) -> Any:
+    """Parse JSON. Raises ValueError on invalid input with either backend."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+__all__ = ["dumps", "loads"]
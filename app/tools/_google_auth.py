@@ -0,0 +1,175 @@
+import os
+import threading
+from datetime import datetime, timezone
+from functools import lru_cache, wraps
+from pathlib import Path
+from typing import Any, Callable, TypeVar
+
+from dotenv import load_dotenv
+from google.auth.exceptions import RefreshError
+from google.auth.transport.requests import Request
+from google.oauth2.credentials import Credentials
+from google_auth_oauthlib.flow import InstalledAppFlow
+from googleapiclient.discovery import build
+
+from app.serialization import loads
+
+load_dotenv()
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# One token covers Gmail, Calendar, and Tasks, so every module shares it.
+SCOPES = [
+    scope.strip()
+    for scope in os.getenv(
+        "GOOGLE_SCOPES",
+        "https://www.googleapis.com/auth/gmail.modify,https://www.googleapis.com/auth/gmail.send,https://www.googleapis.com/auth/calendar,https://www.googleapis.com/auth/tasks",
+    ).split(",")
+    if scope.strip()
+]
+CLIENT_SECRET_FILE = os.getenv("GOOGLE_CLIENT_SECRET_FILE", "credentials.json")
+TOKEN_FILE = os.getenv("GOOGLE_TOKEN_FILE", "token.json")
+
+_creds: Credentials | None = None
+_creds_lock = threading.Lock()
+
+# googleapiclient's httplib2 transport is not thread-safe and tools run on
+# worker threads, so every thread keeps its own built services. Bumping the
+# generation drops them all, e.g. after a token can no longer be refreshed.
+_local = threading.local()
+_generation = 0
+_generation_lock = threading.Lock()
+
+
+@lru_cache(maxsize=4)
+def _token_payload(path: str, mtime_ns: int) -> dict[str, Any]:
+    return loads(Path(path).read_bytes())
+
+
+def _read_token_payload(token_path: Path) -> dict[str, Any]:
+    """Parsed token.json, re-read only when the file changes on disk."""
+    return _token_payload(str(token_path), token_path.stat().st_mtime_ns)
+
+
+def _write_token(token_path: Path, creds: Credentials) -> None:
+    # Write-then-rename so concurrent readers never see a half-written token.
+    tmp_path = token_path.with_name(f"{token_path.name}.tmp")
+    tmp_path.write_text(creds.to_json(), encoding="utf-8")
+    os.replace(tmp_path, token_path)
+
+
+def _granted_scopes(token_payload: dict[str, Any]) -> set[str]:
+    raw_scopes = token_payload.get("scopes", [])
+    if isinstance(raw_scopes, str):
+        return {s for s in raw_scopes.split() if s}
+    if isinstance(raw_scopes, list):
+        return {str(s).strip() for s in raw_scopes if str(s).strip()}
+    return set()
+
+
+def _load_credentials() -> Credentials:
+    creds = None
+    token_path = Path(TOKEN_FILE)
+    token_granted_scopes: set[str] = set()
+
+    if token_path.exists():
+        # One read + parse serves both the scope check and the Credentials object.
+        token_payload = _read_token_payload(token_path)
+        token_granted_scopes = _granted_scopes(token_payload)
+        creds = Credentials.from_authorized_user_info(token_payload, SCOPES)
+
+    # Existing token.json can be missing newly added scopes (e.g. Google Tasks).
+    # Check granted scopes from token payload because creds.has_scopes can be misleading
+    # when credentials are loaded with requested scopes; an unknown scope state
+    # also re-auths to avoid runtime permission failures.
+    scopes_ok = bool(token_granted_scopes) and set(SCOPES).issubset(token_granted_scopes)
+
+    if creds and scopes_ok and creds.valid:
+        return creds
+
+    if creds and scopes_ok and creds.expired and creds.refresh_token:
+        creds.refresh(Request())
+    else:
+        flow = InstalledAppFlow.from_client_secrets_file(CLIENT_SECRET_FILE, SCOPES)
+        creds = flow.run_local_server(port=0)
+
+    _write_token(token_path, creds)
+    return creds
+
+
+def get_credentials() -> Credentials:
+    """Process-wide Google credentials, loaded from token.json once."""
+    global _creds
+    with _creds_lock:
+        if _creds is None or not _creds.valid:
+            _creds = _load_credentials()
+        return _creds
+
+
+def refresh_if_expiring(margin_seconds: float = 300.0) -> None:
+    """Refresh the loaded credentials ahead of time if they expire within the margin.
+
+    Safe to call from a background thread while the user is typing. Does nothing
+    until credentials have been loaded, and never starts an interactive OAuth flow.
+    """
+    with _creds_lock:
+        creds = _creds
+        if creds is None or not creds.refresh_token or creds.expiry is None:
+            return
+        # google-auth stores expiry as a naive UTC datetime.
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        if (creds.expiry - now).total_seconds() > margin_seconds:
+            return
+        try:
+            creds.refresh(Request())
+        except Exception:
+            # The next real API call goes through the normal refresh/re-auth path.
+            return
+        _write_token(Path(TOKEN_FILE), creds)
+
+
+def cached_service(api: str, version: str):
+    """Return this thread's `build(api, version)` client, building it once."""
+    services = getattr(_local, "services", None)
+    if services is None or getattr(_local, "generation", None) != _generation:
+        services = {}
+        _local.services = services
+        _local.generation = _generation
+
+    key = (api, version)
+    service = services.get(key)
+    if service is None:
+        # Use the discovery documents bundled with google-api-python-client
+        # instead of fetching them over HTTP.
+        service = build(
+            api,
+            version,
+            credentials=get_credentials(),
+            static_discovery=True,
+            cache_discovery=False,
+        )
+        services[key] = service
+    return service
+
+
+def reset_services() -> None:
+    """Forget the shared credentials and every thread's cached services."""
+    global _creds, _generation
+    with _creds_lock:
+        _creds = None
+    with _generation_lock:
+        _generation += 1
+
+
+def invalidate_on_refresh_error(func: F) -> F:
+    """Drop cached services when the wrapped call fails to refresh its token."""
+
+    @wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        try:
+            return func(*args, **kwargs)
+        except RefreshError:
+            reset_services()
+            raise
+
+    return wrapper  # type: ignore[return-value]
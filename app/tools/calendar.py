@@ -1,106 +1,77 @@
-import os
 import json
-from datetime import datetime, timezone
+import os
+import time
+from datetime import datetime, timezone, tzinfo
 from functools import lru_cache
 from pathlib import Path
 from typing import Any
 from zoneinfo import ZoneInfo
 
 from dotenv import load_dotenv
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
 
 from app.observability import langsmith_traceable, timed
+from app.tools._google_auth import cached_service, invalidate_on_refresh_error
 load_dotenv()
 
-SCOPES = [
-    scope.strip()
-    for scope in os.getenv(
-        "GOOGLE_SCOPES",
-        "https://www.googleapis.com/auth/gmail.modify,https://www.googleapis.com/auth/gmail.send,https://www.googleapis.com/auth/calendar,https://www.googleapis.com/auth/tasks",
-    ).split(",")
-    if scope.strip()
-]
-CLIENT_SECRET_FILE = os.getenv("GOOGLE_CLIENT_SECRET_FILE", "credentials.json")
-TOKEN_FILE = os.getenv("GOOGLE_TOKEN_FILE", "token.json")
 CALENDAR_ID = os.getenv("CALENDAR_ID", "primary")
 TIMEZONE = os.getenv("TIMEZONE", "UTC")
-
-def _get_credentials() -> Credentials:
-    creds = None
-    token_path = Path(TOKEN_FILE)
-    token_granted_scopes: set[str] = set()
-
-    if token_path.exists():
-        try:
-            token_payload = json.loads(token_path.read_text(encoding="utf-8"))
-            raw_scopes = token_payload.get("scopes", [])
-            if isinstance(raw_scopes, str):
-                token_granted_scopes = {s for s in raw_scopes.split() if s}
-            elif isinstance(raw_scopes, list):
-                token_granted_scopes = {str(s).strip() for s in raw_scopes if str(s).strip()}
-        except Exception:
-            token_granted_scopes = set()
-        creds = Credentials.from_authorized_user_file(str(token_path), SCOPES)
-
-    needs_oauth = not creds
-    if creds:
-        # Existing token.json can be missing newly added scopes (e.g. Google Tasks).
-        # Check granted scopes from token payload because creds.has_scopes can be misleading
-        # when credentials are loaded with requested scopes.
-        if token_granted_scopes and not set(SCOPES).issubset(token_granted_scopes):
-            needs_oauth = True
-        elif not token_granted_scopes:
-            # Unknown scope state: prefer re-auth to avoid runtime permission failures.
-            needs_oauth = True
-
-    if not needs_oauth and creds and not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
-        else:
-            needs_oauth = True
-
-    if needs_oauth:
-        flow = InstalledAppFlow.from_client_secrets_file(CLIENT_SECRET_FILE, SCOPES)
-        creds = flow.run_local_server(port=0)
-        token_path.write_text(creds.to_json(), encoding="utf-8")
-
-    if creds and not creds.valid and creds.expired and creds.refresh_token:
-        creds.refresh(Request())
-        token_path.write_text(creds.to_json(), encoding="utf-8")
-    elif creds and not creds.valid:
-        # Fallback for any other invalid credential state.
-        flow = InstalledAppFlow.from_client_secrets_file(CLIENT_SECRET_FILE, SCOPES)
-        creds = flow.run_local_server(port=0)
-        token_path.write_text(creds.to_json(), encoding="utf-8")
-
-    return creds
+CALENDAR_TZ_CACHE_FILE = os.getenv("CALENDAR_TZ_CACHE_FILE", "calendar_tz.json")
+_CALENDAR_TZ_CACHE_TTL = 30 * 24 * 3600
 
 
 def _calendar_service():
-    creds = _get_credentials()
-    return build("calendar", "v3", credentials=creds)
+    return cached_service("calendar", "v3")
 
 
 def _configured_timezone_name() -> str:
     return (TIMEZONE or "").strip() or "UTC"
 
 
+def _read_cached_calendar_timezone() -> str:
+    cache_path = Path(CALENDAR_TZ_CACHE_FILE)
+    try:
+        if time.time() - cache_path.stat().st_mtime > _CALENDAR_TZ_CACHE_TTL:
+            return ""
+        cached = json.loads(cache_path.read_text(encoding="utf-8"))
+    except Exception:
+        return ""
+    if cached.get("calendar_id") != CALENDAR_ID:
+        return ""
+    return str(cached.get("timeZone", "")).strip()
+
+
+def _write_cached_calendar_timezone(tz_name: str) -> None:
+    cache_path = Path(CALENDAR_TZ_CACHE_FILE)
+    tmp_path = cache_path.with_name(f"{cache_path.name}.tmp")
+    try:
+        tmp_path.write_text(json.dumps({"calendar_id": CALENDAR_ID, "timeZone": tz_name}), encoding="utf-8")
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+
+
 @lru_cache(maxsize=1)
 def _calendar_timezone_name() -> str:
+    # The calendar's timezone rarely changes; a disk copy saves an API round
+    # trip on every cold start.
+    cached = _read_cached_calendar_timezone()
+    if cached:
+        return cached
     try:
         service = _calendar_service()
         calendar = service.calendars().get(calendarId=CALENDAR_ID).execute()
         tz_name = str(calendar.get("timeZone", "")).strip()
         if tz_name:
+            _write_cached_calendar_timezone(tz_name)
             return tz_name
     except Exception:
         pass
     return "UTC"
 
 
+# TIMEZONE is fixed per process and the calendar lookup is already cached,
+# so the answer never changes after the first call.
+@lru_cache(maxsize=1)
 def effective_timezone_name() -> str:
     configured = _configured_timezone_name()
     # If configured timezone is UTC, prefer the calendar's own timezone.
@@ -110,14 +81,19 @@ def effective_timezone_name() -> str:
     return configured
 
 
-def _calendar_tz():
-    tz_name = effective_timezone_name()
+@lru_cache(maxsize=8)
+def zone_for(tz_name: str) -> tzinfo:
+    """Resolve a timezone name once; unknown names fall back to UTC."""
     try:
         return ZoneInfo(tz_name)
     except Exception:
         return timezone.utc
 
 
+def _calendar_tz():
+    return zone_for(effective_timezone_name())
+
+
 def normalize_to_calendar_tz(dt: datetime) -> datetime:
     tz = _calendar_tz()
     if dt.tzinfo is None:
@@ -129,6 +105,12 @@ def _parse_iso_datetime(value: str, field_name: str) -> datetime:
     raw = str(value or "").strip()
     if not raw:
         raise ValueError(f"Missing required field: {field_name}")
+    try:
+        # Python 3.11+ accepts a trailing "Z" directly; the replace is only
+        # needed as a fallback for older interpreters.
+        return datetime.fromisoformat(raw)
+    except ValueError:
+        pass
     try:
         return datetime.fromisoformat(raw.replace("Z", "+00:00"))
     except ValueError as exc:
@@ -139,6 +121,7 @@ def _parse_iso_datetime(value: str, field_name: str) -> datetime:
 
 @langsmith_traceable(name="list_events", run_type="tool")
 @timed("list_events")
+@invalidate_on_refresh_error
 def list_events(time_min: str, time_max: str, max_results: int = 10):
     service = _calendar_service()
 
@@ -166,6 +149,7 @@ def list_events(time_min: str, time_max: str, max_results: int = 10):
 
 @langsmith_traceable(name="add_event", run_type="tool")
 @timed("add_event")
+@invalidate_on_refresh_error
 def add_event(summary: str, start_iso: str, end_iso: str, description: str = "", location: str = "") -> dict[str, Any]:
     """Create an event. Keep this behind human approval in the graph."""
     start_dt = _parse_iso_datetime(start_iso, "start_iso")
@@ -197,12 +181,7 @@ def add_event(summary: str, start_iso: str, end_iso: str, description: str = "",
 
 def get_current_time_iso() -> str:
     """Get the current time in ISO8601 format."""
-    tz_name = effective_timezone_name()
-    try:
-        tz = ZoneInfo(tz_name)
-    except Exception:
-        tz = timezone.utc
-    return datetime.now(tz).replace(microsecond=0).isoformat(timespec="seconds")
+    return datetime.now(_calendar_tz()).replace(microsecond=0).isoformat(timespec="seconds")
 
 def now_utc_iso() -> str:
     return datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
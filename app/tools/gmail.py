@@ -1,71 +1,60 @@
 import base64
 import os
-from email.message import EmailMessage
-from pathlib import Path
-from typing import Any
+from email.mime.text import MIMEText
+from typing import Any, Iterator
 
 from dotenv import load_dotenv
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
 
 from app.observability import langsmith_traceable, timed
+from app.tools._google_auth import cached_service, invalidate_on_refresh_error
 
 load_dotenv()
 
 
-SCOPES = [
-    scope.strip()
-    for scope in os.getenv(
-        "GOOGLE_SCOPES",
-        "https://www.googleapis.com/auth/gmail.modify,https://www.googleapis.com/auth/gmail.send,https://www.googleapis.com/auth/calendar",
-    ).split(",")
-    if scope.strip()
-]
-CLIENT_SECRET_FILE = os.getenv("GOOGLE_CLIENT_SECRET_FILE", "credentials.json")
-TOKEN_FILE = os.getenv("GOOGLE_TOKEN_FILE", "token.json")
 GMAIL_USER_ID = os.getenv("GMAIL_USER_ID", "me")
+_HEADER_KEYS = frozenset({"from", "subject", "date"})
 
 
-def _get_credentials() -> Credentials:
-    creds = None
-    token_path = Path(TOKEN_FILE)
-
-    if token_path.exists():
-        creds = Credentials.from_authorized_user_file(str(token_path), SCOPES)
+def _gmail_service():
+    return cached_service("gmail", "v1")
 
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
-        else:
-            flow = InstalledAppFlow.from_client_secrets_file(CLIENT_SECRET_FILE, SCOPES)
-            creds = flow.run_local_server(port=0)
-        token_path.write_text(creds.to_json(), encoding="utf-8")
+def _walk_parts(parts: list[dict[str, Any]]) -> Iterator[dict[str, Any]]:
+    for part in parts:
+        yield part
+        yield from _walk_parts(part.get("parts", []))
 
-    return creds
 
+def _decode_part(part: dict[str, Any]) -> str:
+    return base64.urlsafe_b64decode(part["body"]["data"]).decode("utf-8", errors="replace")
 
-def _gmail_service():
-    creds = _get_credentials()
-    return build("gmail", "v1", credentials=creds)
 
 def _extract_body(payload) -> str:
+    """Return the first text/plain part (searching nested multiparts), else the first text/html."""
     if "parts" in payload:
-        for part in payload["parts"]:
-            if part.get("mimeType") == "text/plain":
-                return base64.urlsafe_b64decode(part["body"]["data"]).decode("utf-8")
-            elif part.get("mimeType") == "text/html":
-                return base64.urlsafe_b64decode(part["body"]["data"]).decode("utf-8")
-    elif "body" in payload and payload["body"].get("data"):
-        return base64.urlsafe_b64decode(payload["body"]["data"]).decode("utf-8")
+        html_part = None
+        for part in _walk_parts(payload["parts"]):
+            if not part.get("body", {}).get("data"):
+                continue
+            mime_type = part.get("mimeType")
+            if mime_type == "text/plain":
+                return _decode_part(part)
+            if mime_type == "text/html" and html_part is None:
+                html_part = part
+        return _decode_part(html_part) if html_part is not None else ""
+    if payload.get("body", {}).get("data"):
+        return _decode_part(payload)
     return ""
 
 
-
 @langsmith_traceable(name="get_emails", run_type="tool")
 @timed("get_emails")
-def get_emails(query: str = "is:unread", max_results: int = 5) -> list[dict[str, Any]]:
+@invalidate_on_refresh_error
+def get_emails(query: str = "is:unread", max_results: int = 5, include_body: bool = True) -> list[dict[str, Any]]:
+    """Search the mailbox and return header fields (and bodies) for each match.
+
+    All message fetches go out in one batch HTTP request. With
+    `include_body=False` only the From/Subject/Date headers are downloaded.
+    """
     service = _gmail_service()
     response = (
         service.users()
@@ -74,47 +63,65 @@ def get_emails(query: str = "is:unread", max_results: int = 5) -> list[dict[str,
         .execute()
     )
 
-    messages = response.get("messages", [])
-    output = []
+    message_ids = [msg["id"] for msg in response.get("messages", [])]
+    fetched: dict[str, dict[str, Any]] = {}
+    errors: list[Exception] = []
 
-    for msg in messages:
-        full = (
-            service.users()
-            .messages()
-            .get(userId=GMAIL_USER_ID, id=msg["id"], format="full")
-            .execute()
-        )
+    def _on_response(request_id: str, response: dict[str, Any], exception: Exception | None) -> None:
+        if exception is not None:
+            errors.append(exception)
+        else:
+            fetched[request_id] = response
+
+    batch = service.new_batch_http_request(callback=_on_response)
+    for idx, message_id in enumerate(message_ids):
+        if include_body:
+            request = service.users().messages().get(userId=GMAIL_USER_ID, id=message_id, format="full")
+        else:
+            request = service.users().messages().get(
+                userId=GMAIL_USER_ID,
+                id=message_id,
+                format="metadata",
+                metadataHeaders=["From", "Subject", "Date"],
+            )
+        batch.add(request, request_id=str(idx))
+    if message_ids:
+        batch.execute()
+    if errors:
+        raise errors[0]
 
+    output = []
+    for idx in range(len(message_ids)):
+        full = fetched[str(idx)]
         headers = {
-            h["name"].lower(): h["value"]
+            name: h["value"]
             for h in full["payload"]["headers"]
+            if (name := h["name"].lower()) in _HEADER_KEYS
         }
 
-        body = _extract_body(full["payload"])
-
-        output.append(
-            {
-                "id": full["id"],
-                "threadId": full["threadId"],
-                "from": headers.get("from", ""),
-                "subject": headers.get("subject", ""),
-                "date": headers.get("date", ""),
-                "body": body,
-            }
-        )
+        item = {
+            "id": full["id"],
+            "threadId": full["threadId"],
+            "from": headers.get("from", ""),
+            "subject": headers.get("subject", ""),
+            "date": headers.get("date", ""),
+        }
+        if include_body:
+            item["body"] = _extract_body(full["payload"])
+        output.append(item)
 
     return output
 
 
 @langsmith_traceable(name="send_email", run_type="tool")
 @timed("send_email")
+@invalidate_on_refresh_error
 def send_email(to: str, subject: str, body: str):
     service = _gmail_service()
 
-    message = EmailMessage()
+    message = MIMEText(body, "plain", "utf-8")
     message["To"] = to
     message["Subject"] = subject
-    message.set_content(body)
 
     encoded = base64.urlsafe_b64encode(message.as_bytes()).decode("utf-8")
 
@@ -1,12 +1,31 @@
 import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Any
+
+import httpx
 from dotenv import load_dotenv
 
+from app.caching import ttl_cached
 from app.observability import langsmith_traceable, timed
 
 load_dotenv()
 
+TAVILY_API_KEY = os.getenv("TAVILY_API_KEY", "").strip()
+FEED_TIMEOUT_SECONDS = 3.0
+_FEEDS = (
+    "https://feeds.bbci.co.uk/news/rss.xml",
+    "https://feeds.reuters.com/reuters/topNews",
+    "http://rss.cnn.com/rss/edition.rss",
+    "https://feeds.feedburner.com/ndtvnews-top-stories",
+    "https://www.thehindu.com/news/feeder/default.rss",
+)
+_NEWS_RE = re.compile(r"\b(?:news|headlines?)\b", re.IGNORECASE)
+
 
+@lru_cache(maxsize=1)
 def _get_ddgs_class():
     """Resolve a DuckDuckGo search client class from available packages."""
     try:
@@ -22,28 +41,45 @@ def _get_ddgs_class():
             return None
 
 
+# DDGS clients are not thread-safe and searches run on tool worker threads,
+# so every thread keeps its own long-lived client and HTTP session.
+_local = threading.local()
+
+
+def _ddgs_client():
+    """This thread's DuckDuckGo client, created on first use."""
+    client = getattr(_local, "ddgs", None)
+    if client is None:
+        ddgs_cls = _get_ddgs_class()
+        client = ddgs_cls() if ddgs_cls is not None else None
+        _local.ddgs = client
+    return client
+
+
+@lru_cache(maxsize=1)
+def _tavily_client():
+    from tavily import TavilyClient
+
+    return TavilyClient(api_key=TAVILY_API_KEY)
+
+
 @langsmith_traceable(name="web_search", run_type="tool")
 @timed("web_search")
+@ttl_cached(maxsize=256, ttl=120)
 def web_search(query: str, max_results: int = 5) -> list[dict[str, Any]]:
     """Try Tavily first (if configured), fallback to DuckDuckGo."""
 
     # Smart query enhancement for news
-    lower_q = query.lower()
-    if "news" in lower_q or "headline" in lower_q:
+    if _NEWS_RE.search(query):
         query = (
             f"{query} site:bbc.com OR site:reuters.com "
             "OR site:cnn.com OR site:ndtv.com OR site:thehindu.com"
         )
 
-    tavily_key = os.getenv("TAVILY_API_KEY", "").strip()
-
     # 🔹 Try Tavily first
-    if tavily_key:
+    if TAVILY_API_KEY:
         try:
-            from tavily import TavilyClient
-
-            client = TavilyClient(api_key=tavily_key)
-            result = client.search(query=query, max_results=max_results)
+            result = _tavily_client().search(query=query, max_results=max_results)
 
             return [
                 {
@@ -59,28 +95,30 @@ def web_search(query: str, max_results: int = 5) -> list[dict[str, Any]]:
 
     # Fallback to DuckDuckGo
     try:
-        ddgs_cls = _get_ddgs_class()
-        if ddgs_cls is None:
+        ddgs = _ddgs_client()
+        if ddgs is None:
             print("DuckDuckGo client not installed. Install `ddgs` or `duckduckgo-search`.")
             return []
 
-        with ddgs_cls() as ddgs:
-            rows = list(ddgs.text(query, max_results=max_results))
+        rows = list(ddgs.text(query, max_results=max_results))
 
-            return [
-                {
-                    "title": row.get("title", ""),
-                    "url": row.get("href", ""),
-                    "content": row.get("body", ""),
-                }
-                for row in rows
-            ]
+        return [
+            {
+                "title": row.get("title", ""),
+                "url": row.get("href", ""),
+                "content": row.get("body", ""),
+            }
+            for row in rows
+        ]
     except Exception as e:
         print("DDGS search failed:", e)
+        # Start this thread from a fresh session in case this one is broken.
+        _local.ddgs = None
         return []
     
 @langsmith_traceable(name="get_latest_news", run_type="tool")
 @timed("get_latest_news")
+@ttl_cached(maxsize=16, ttl=300)
 def get_latest_news(max_results=5):
     try:
         import feedparser  # type: ignore
@@ -88,23 +126,26 @@ def get_latest_news(max_results=5):
         print("RSS parser not installed. Install `feedparser` to use latest news.")
         return []
 
-    feeds = [
-        "https://feeds.bbci.co.uk/news/rss.xml",
-        "https://feeds.reuters.com/reuters/topNews",
-        "http://rss.cnn.com/rss/edition.rss",
-        "https://feeds.feedburner.com/ndtvnews-top-stories",
-        "https://www.thehindu.com/news/feeder/default.rss"
-    ]
+    def _fetch_one(feed_url: str):
+        # Download with a hard timeout; feedparser's own fetch has none.
+        try:
+            response = httpx.get(feed_url, timeout=FEED_TIMEOUT_SECONDS, follow_redirects=True)
+            response.raise_for_status()
+        except Exception as e:
+            print(f"RSS fetch failed for {feed_url}:", e)
+            return []
+        return feedparser.parse(response.content).entries[:max_results]
 
     results = []
 
-    for feed_url in feeds:
-        feed = feedparser.parse(feed_url)
-        for entry in feed.entries[:max_results]:
-            results.append({
-                "title": entry.title,
-                "url": entry.link,
-                "published": entry.get("published", ""),
-            })
+    # Feeds are independent, so fetch them concurrently; map keeps feed order.
+    with ThreadPoolExecutor(max_workers=len(_FEEDS)) as executor:
+        for entries in executor.map(_fetch_one, _FEEDS):
+            for entry in entries:
+                results.append({
+                    "title": entry.title,
+                    "url": entry.link,
+                    "published": entry.get("published", ""),
+                })
 
     return results[:max_results]
@@ -1,26 +1,20 @@
 from datetime import datetime, timezone
 from typing import Any
 
-from googleapiclient.discovery import build
-
 from app.observability import langsmith_traceable, timed
-from app.tools.calendar import _get_credentials, _parse_iso_datetime, normalize_to_calendar_tz 
+from app.tools._google_auth import cached_service, invalidate_on_refresh_error
+from app.tools.calendar import _parse_iso_datetime, normalize_to_calendar_tz
 
 
 def _tasks_service():
-    creds = _get_credentials()
-    return build("tasks", "v1", credentials=creds)
+    return cached_service("tasks", "v1")
 
 
 def _to_utc_rfc3339(dt: datetime) -> str:
     return dt.astimezone(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
 
 
-@langsmith_traceable(name="add_task", run_type="tool")
-@timed("add_task")
-def add_task(title: list[str], notes: str = "", due_iso: str = "") -> dict[str, Any]:
-    """Create a task. Keep this behind human approval in the graph."""
-    service = _tasks_service()
+def _task_body(title: str, notes: str, due_iso: str) -> dict[str, Any]:
     clean_title = str(title or "").strip()
     if not clean_title:
         raise ValueError("Missing required field: title")
@@ -34,8 +28,10 @@ def add_task(title: list[str], notes: str = "", due_iso: str = "") -> dict[str,
         due_dt = _parse_iso_datetime(due_iso, "due_iso")
         due_dt = normalize_to_calendar_tz(due_dt)
         task_body["due"] = _to_utc_rfc3339(due_dt)
+    return task_body
 
-    created = service.tasks().insert(tasklist="@default", body=task_body).execute()
+
+def _created_task(created: dict[str, Any]) -> dict[str, Any]:
     return {
         "id": created.get("id"),
         "title": created.get("title"),
@@ -44,13 +40,59 @@ def add_task(title: list[str], notes: str = "", due_iso: str = "") -> dict[str,
     }
 
 
+@langsmith_traceable(name="add_task", run_type="tool")
+@timed("add_task")
+@invalidate_on_refresh_error
+def add_task(title: list[str], notes: str = "", due_iso: str = "") -> dict[str, Any]:
+    """Create a task. Keep this behind human approval in the graph."""
+    service = _tasks_service()
+    task_body = _task_body(title, notes, due_iso)
+    created = service.tasks().insert(tasklist="@default", body=task_body).execute()
+    return _created_task(created)
+
+
+@langsmith_traceable(name="add_tasks", run_type="tool")
+@timed("add_tasks")
+@invalidate_on_refresh_error
+def add_tasks(titles: list[str], notes: str = "", due_iso: str = "") -> list[dict[str, Any] | Exception]:
+    """Create several tasks sharing `notes` and `due_iso`. Keep this behind human approval.
+
+    All inserts go out in one batch HTTP request. Returns one entry per title,
+    in order: the created task, or the exception that insert failed with.
+    """
+    service = _tasks_service()
+    bodies = [_task_body(title, notes, due_iso) for title in titles]
+    responses: dict[str, dict[str, Any] | Exception] = {}
+
+    def _on_response(request_id: str, response: dict[str, Any], exception: Exception | None) -> None:
+        responses[request_id] = exception if exception is not None else _created_task(response)
+
+    batch = service.new_batch_http_request(callback=_on_response)
+    for idx, body in enumerate(bodies):
+        batch.add(service.tasks().insert(tasklist="@default", body=body), request_id=str(idx))
+    if bodies:
+        batch.execute()
+    return [responses[str(idx)] for idx in range(len(bodies))]
+
+
 @langsmith_traceable(name="list_tasks", run_type="tool")
 @timed("list_tasks")
-def list_tasks(due_min_iso: str = "", due_max_iso: str = "", max_results: int = 10) -> list[dict[str, Any]]:
-    """List tasks, optionally filtering by due date range."""
+@invalidate_on_refresh_error
+def list_tasks(
+    due_min_iso: str = "",
+    due_max_iso: str = "",
+    max_results: int = 10,
+    fields: str = "",
+) -> list[dict[str, Any]]:
+    """List tasks, optionally filtering by due date range.
+
+    `fields` (e.g. "id,title") asks the API to return only those keys per task.
+    """
     service = _tasks_service()
 
     query = {}
+    if fields:
+        query["fields"] = f"items({fields})"
     if due_min_iso:
         due_min_dt = _parse_iso_datetime(due_min_iso, "due_min_iso")
         due_min_dt = normalize_to_calendar_tz(due_min_dt)
@@ -66,18 +108,40 @@ def list_tasks(due_min_iso: str = "", due_max_iso: str = "", max_results: int =
 
 @langsmith_traceable(name="complete_task", run_type="tool")
 @timed("complete_task")
+@invalidate_on_refresh_error
 def complete_task(task_ids: list[str]) -> dict[str, Any]:
-    """Mark a task as completed by ID. Keep this behind human approval in the graph."""
+    """Mark tasks as completed by ID. Keep this behind human approval in the graph.
+
+    All patches go out in one batch HTTP request instead of one request per task.
+    """
     service = _tasks_service()
     now_iso = _to_utc_rfc3339(datetime.now(timezone.utc))
-    updated_tasks = []
-    for task_id in task_ids:
-        updated = service.tasks().patch(
-            tasklist="@default",
-            task=task_id,
-            body={"status": "completed", "completed": now_iso},
-        ).execute()
-        updated_tasks.append(updated)
+    responses: dict[str, dict[str, Any]] = {}
+    errors: list[Exception] = []
+
+    def _on_response(request_id: str, response: dict[str, Any], exception: Exception | None) -> None:
+        if exception is not None:
+            errors.append(exception)
+        else:
+            responses[request_id] = response
+
+    batch = service.new_batch_http_request(callback=_on_response)
+    for idx, task_id in enumerate(task_ids):
+        batch.add(
+            service.tasks().patch(
+                tasklist="@default",
+                task=task_id,
+                body={"status": "completed", "completed": now_iso},
+            ),
+            request_id=str(idx),
+        )
+    if task_ids:
+        batch.execute()
+    if errors:
+        raise errors[0]
+
+    updated_tasks = [responses[str(idx)] for idx in range(len(task_ids))]
+    updated = updated_tasks[-1] if updated_tasks else {}
     return {
         "updated_tasks": updated_tasks,
         "title": updated.get("title"),
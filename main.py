@@ -1,18 +1,25 @@
 import os
+import threading
 import uuid
 
 from dotenv import load_dotenv
 from langchain_core.messages import AIMessage, HumanMessage
 
+from app.agent.streaming import stream_to
 from app.graph import GUARDED_ACTIONS, build_graph
 from app.observability import langsmith_traceable, timed, timed_block
+from app.tools._google_auth import refresh_if_expiring
 
 load_dotenv()
 if not os.getenv("GROQ_API_KEY"):
     load_dotenv(".env.example")
 
 
-def _last_ai_text(messages) -> str:
+def _last_ai_text(values) -> str:
+    messages = values.get("messages", [])
+    idx = values.get("last_ai_idx")
+    if isinstance(idx, int) and 0 <= idx < len(messages) and isinstance(messages[idx], AIMessage):
+        return str(messages[idx].content)
     for msg in reversed(messages):
         if isinstance(msg, AIMessage):
             return str(msg.content)
@@ -62,13 +69,24 @@ def run_chat() -> None:
     print("Local Agent started. Type 'exit' to quit.")
 
     while True:
+        # Refresh a nearly expired Google token while the user types, so the
+        # next tool call doesn't pay for it.
+        threading.Thread(target=refresh_if_expiring, daemon=True).start()
         user_input = input("\nYou: ").strip()
         if user_input.lower() in {"exit", "quit"}:
             print("Bye")
             break
 
+        streamed: list[str] = []
+
+        def _print_token(text: str) -> None:
+            if not streamed:
+                print("\nAgent:")
+            streamed.append(text)
+            print(text, end="", flush=True)
+
         try:
-            with timed_block("chat_turn"):
+            with timed_block("chat_turn"), stream_to(_print_token):
                 app.invoke({"messages": [HumanMessage(content=user_input)]}, config=config)
                 _handle_interrupts(app, config)
         except Exception as exc:
@@ -76,7 +94,10 @@ def run_chat() -> None:
             continue
 
         snapshot = app.get_state(config)
-        output = _last_ai_text(snapshot.values.get("messages", []))
+        output = _last_ai_text(snapshot.values)
+        if streamed and "".join(streamed).endswith(output):
+            print()
+            continue
         print(f"\nAgent:\n{output}")
 
 
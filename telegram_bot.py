@@ -1,73 +1,149 @@
+import asyncio
+import logging
 import os
-from collections import defaultdict
+import re
+import secrets
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any
 
 from dotenv import load_dotenv
 from langchain_core.messages import AIMessage, HumanMessage
-from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
+from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Message, Update
+from telegram.error import RetryAfter, TelegramError
 from telegram.ext import ApplicationBuilder, CallbackQueryHandler, CommandHandler, ContextTypes, MessageHandler, filters
 
-from app.graph import GUARDED_ACTIONS, build_graph
+try:
+    import uvloop
+except Exception:  # pragma: no cover - optional dependency
+    uvloop = None
+
+from app.agent import route_after_assistant
+from app.agent.streaming import stream_to
+from app.caching import TTLCache
+from app.env import env_float, env_int
+from app.graph import GUARDED_ACTIONS, get_app
+from app.serialization import dumps
 
 load_dotenv()
 if not os.getenv("GROQ_API_KEY"):
     load_dotenv(".env.example")
 
+logger = logging.getLogger(__name__)
+
 TELEGRAM_BOT_TOKEN = (os.getenv("TELEGRAM_BOT_TOKEN", "") or "").strip().strip('"').strip("'")
 GROQ_API_KEY = (os.getenv("GROQ_API_KEY", "") or "").strip().strip('"').strip("'")
 
-APP = build_graph()
-CHAT_CONFIGS: dict[int, dict] = defaultdict(dict)
-PENDING_APPROVALS: dict[int, dict] = {}
+# Bounded so a public bot's memory tracks recently active chats, not every
+# chat it has ever seen. Thread state itself lives in the checkpointer.
+CHAT_CONFIGS = TTLCache(maxsize=50_000, ttl=7 * 24 * 3600)
+# Graph turns run on worker threads; the per-chat lock keeps one chat's turns
+# in order while other chats proceed in parallel. Each entry counts the
+# coroutines holding or waiting on the lock and is dropped when that hits zero.
+CHAT_LOCKS: dict[int, tuple[asyncio.Lock, int]] = {}
+# One queue and consumer task per chat: messages from a chat are answered in
+# the order they arrived.
+CHAT_QUEUES: dict[int, asyncio.Queue] = {}
+CHAT_WORKERS: dict[int, asyncio.Task] = {}
+# A chat's worker exits after this long without messages; the next message
+# starts a new one.
+CHAT_IDLE_SECONDS = env_float("TELEGRAM_CHAT_IDLE_SECONDS", 600.0, minimum=1.0)
+GRAPH_WORKERS = env_int("TELEGRAM_GRAPH_WORKERS", 32, minimum=1)
+# Public HTTPS base URL Telegram should push updates to; empty keeps long polling.
+WEBHOOK_URL = os.getenv("TELEGRAM_WEBHOOK_URL", "").strip().rstrip("/")
+WEBHOOK_LISTEN = os.getenv("TELEGRAM_WEBHOOK_LISTEN", "0.0.0.0")
+WEBHOOK_PORT = env_int("PORT", 8443, minimum=1)
+WEBHOOK_PATH = "telegram"
+# Telegram echoes this in the X-Telegram-Bot-Api-Secret-Token header and PTB
+# rejects updates without it. run_webhook re-registers the webhook on every
+# start, so a random per-process secret works when none is configured.
+WEBHOOK_SECRET = os.getenv("TELEGRAM_WEBHOOK_SECRET", "").strip() or secrets.token_urlsafe(32)
+
+MAX_ARGS_CHARS = 3500
+TELEGRAM_MAX_CHARS = 4096
+# Minimum gap between edits of a streaming reply; Telegram rate-limits edits.
+STREAM_EDIT_SECONDS = env_float("TELEGRAM_STREAM_EDIT_SECONDS", 0.4, minimum=0.0)
+
+_APPROVAL_RE = re.compile(r"^approval:(yes|no)$")
+_TEXT_FILTER = filters.TEXT & ~filters.COMMAND
+
+_APPROVAL_KEYBOARD = InlineKeyboardMarkup(
+    [
+        [
+            InlineKeyboardButton("Approve", callback_data="approval:yes"),
+            InlineKeyboardButton("Reject", callback_data="approval:no"),
+        ]
+    ]
+)
 
 
 def _chat_config(chat_id: int) -> dict:
     config = CHAT_CONFIGS.get(chat_id)
-    if not config:
+    if config is None:
         config = {"configurable": {"thread_id": f"telegram-{chat_id}"}}
-        CHAT_CONFIGS[chat_id] = config
+        CHAT_CONFIGS.set(chat_id, config)
     return config
 
 
-def _last_ai_text(messages) -> str:
+def _last_ai_text(values) -> str:
+    messages = values.get("messages", [])
+    idx = values.get("last_ai_idx")
+    if isinstance(idx, int) and 0 <= idx < len(messages) and isinstance(messages[idx], AIMessage):
+        return str(messages[idx].content)
     for msg in reversed(messages):
         if isinstance(msg, AIMessage):
             return str(msg.content)
     return ""
 
 
-def _resume_until_waiting(config: dict) -> dict | None:
-    while True:
-        snapshot = APP.get_state(config)
-        if not snapshot.next:
-            return None
+def _reply_text(values) -> str:
+    return _last_ai_text(values) or "No response generated."
 
-        if "execute_action" not in snapshot.next:
-            APP.invoke(None, config=config)
-            continue
 
-        planned = snapshot.values.get("planned_action", {})
+def _pending_approval(snapshot) -> dict | None:
+    """The guarded action the thread is paused on, read from the checkpoint."""
+    if "execute_action" not in (snapshot.next or ()):
+        return None
+    planned = snapshot.values.get("planned_action", {})
+    action_name = planned.get("name", "respond")
+    if action_name not in GUARDED_ACTIONS:
+        return None
+    return {"action": action_name, "args": planned.get("args", {})}
+
+
+def _resume_until_waiting(config: dict, values: dict[str, Any]) -> tuple[dict | None, dict[str, Any]]:
+    """Auto-approve non-guarded actions starting from the state `invoke` returned.
+
+    Returns the pending guarded action (or None) and the latest state values,
+    so callers don't need another checkpoint read to build their reply.
+    """
+    # The graph only pauses before execute_action, so the state returned by
+    # invoke says whether it stopped there; no need to re-read the checkpoint.
+    while route_after_assistant(values) == "execute_action":
+        planned = values.get("planned_action", {})
         action_name = planned.get("name", "respond")
         action_args = planned.get("args", {})
 
         if action_name in GUARDED_ACTIONS:
-            return {"action": action_name, "args": action_args}
+            return {"action": action_name, "args": action_args}, values
 
-        APP.update_state(config, {"human_approved": True})
-        APP.invoke(None, config=config)
+        get_app().update_state(config, {"human_approved": True})
+        values = get_app().invoke(None, config=config)
+    return None, values
+
+
+def _format_args(action_args: dict) -> str:
+    # Telegram rejects messages over 4096 characters; leave room for the rest.
+    text = dumps(action_args)
+    if len(text) > MAX_ARGS_CHARS:
+        return text[:MAX_ARGS_CHARS] + "…"
+    return text
 
 
 async def _send_approval_prompt(message_target, action_name: str, action_args: dict) -> None:
-    keyboard = InlineKeyboardMarkup(
-        [
-            [
-                InlineKeyboardButton("Approve", callback_data="approval:yes"),
-                InlineKeyboardButton("Reject", callback_data="approval:no"),
-            ]
-        ]
-    )
     await message_target.reply_text(
-        f"Approval required:\nAction: {action_name}\nArgs: {action_args}",
-        reply_markup=keyboard,
+        f"Approval required:\nAction: {action_name}\nArgs: {_format_args(action_args)}",
+        reply_markup=_APPROVAL_KEYBOARD,
     )
 
 
@@ -77,34 +153,182 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     await update.message.reply_text("Agent is ready on Telegram. Send a message.")
 
 
+def _retry_seconds(exc: RetryAfter) -> float:
+    retry_after = exc.retry_after
+    return retry_after.total_seconds() if hasattr(retry_after, "total_seconds") else float(retry_after)
+
+
+class _StreamedReply:
+    """Show model tokens as one Telegram message that is edited as text arrives.
+
+    `on_token` runs on the graph's worker thread and only appends to a list;
+    edits are sent from the event loop at most every STREAM_EDIT_SECONDS.
+    """
+
+    def __init__(self, message: Message) -> None:
+        self._message = message
+        self._parts: list[str] = []
+        self._sent: Message | None = None
+        self._shown = ""
+        self._done = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def on_token(self, text: str) -> None:
+        self._parts.append(text)
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._pump())
+
+    async def _pump(self) -> None:
+        while not self._done.is_set():
+            try:
+                await asyncio.wait_for(self._done.wait(), STREAM_EDIT_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            if self._done.is_set():
+                return
+            text = "".join(self._parts)[:TELEGRAM_MAX_CHARS]
+            if not text.strip() or text == self._shown:
+                continue
+            try:
+                await self._show(text)
+            except RetryAfter as exc:
+                await asyncio.sleep(_retry_seconds(exc))
+            except TelegramError as exc:
+                # Streamed edits are best-effort ("message is not modified",
+                # timeouts, network blips); the next tick or finish() catches up.
+                logger.debug("Streamed edit failed: %s", exc)
+
+    async def _show(self, text: str) -> None:
+        if self._sent is None:
+            self._sent = await self._message.reply_text(text)
+        else:
+            await self._sent.edit_text(text)
+        self._shown = text
+
+    async def finish(self, final_text: str | None) -> None:
+        """Stop streaming and, if given, make `final_text` the visible reply."""
+        self._done.set()
+        if self._task is not None:
+            await self._task
+        if final_text is None:
+            return
+        final_text = final_text[:TELEGRAM_MAX_CHARS]
+        if final_text == self._shown:
+            return
+        for _ in range(3):
+            try:
+                await self._show(final_text)
+                return
+            except RetryAfter as exc:
+                await asyncio.sleep(_retry_seconds(exc))
+            except TelegramError as exc:
+                logger.warning("Final streamed edit failed, sending a new message: %s", exc)
+                break
+        # The answer must still arrive even if the streamed message is stuck.
+        await self._message.reply_text(final_text)
+
+
+@asynccontextmanager
+async def _chat_lock(chat_id: int):
+    lock, users = CHAT_LOCKS.get(chat_id, (None, 0))
+    if lock is None:
+        lock = asyncio.Lock()
+    CHAT_LOCKS[chat_id] = (lock, users + 1)
+    try:
+        async with lock:
+            yield
+    finally:
+        users = CHAT_LOCKS[chat_id][1] - 1
+        if users:
+            CHAT_LOCKS[chat_id] = (lock, users)
+        else:
+            del CHAT_LOCKS[chat_id]
+
+
+async def _run_chat_turn(chat_id: int, message: Message, user_message: str) -> None:
+    async with _chat_lock(chat_id):
+        config = _chat_config(chat_id)
+        human = HumanMessage(content=user_message)
+        try:
+            before = await asyncio.to_thread(get_app().get_state, config)
+            # Checked here rather than on receipt: an earlier queued turn may
+            # have stopped at an approval since this message arrived.
+            if _pending_approval(before) is not None:
+                await message.reply_text("Please approve or reject the pending action first.")
+                return
+
+            streamed = _StreamedReply(message)
+            streamed.start()
+            try:
+                # to_thread copies the context, so the graph's worker thread
+                # sees this stream callback.
+                with stream_to(streamed.on_token):
+                    values = await asyncio.to_thread(get_app().invoke, {"messages": [human]}, config=config)
+                    pending, values = await asyncio.to_thread(_resume_until_waiting, config, values)
+            except Exception:
+                await streamed.finish(None)
+                raise
+            if pending:
+                await streamed.finish(None)
+                await _send_approval_prompt(message, pending["action"], pending["args"])
+                return
+
+            await streamed.finish(_reply_text(values))
+        except Exception as exc:
+            await message.reply_text(f"Agent error: {exc}")
+
+
+async def _chat_worker(chat_id: int, queue: asyncio.Queue) -> None:
+    while True:
+        try:
+            message, user_message = await asyncio.wait_for(queue.get(), CHAT_IDLE_SECONDS)
+        except asyncio.TimeoutError:
+            # No await between the check and the cleanup, so a handler can't
+            # enqueue onto this queue after it is dropped.
+            if queue.empty():
+                _retire_chat(chat_id)
+                return
+            continue
+        try:
+            await _run_chat_turn(chat_id, message, user_message)
+        except Exception:
+            # e.g. the error reply itself failed to send. Keep serving the
+            # chat; a dead worker would strand every later message.
+            logger.exception("Telegram turn failed for chat %s", chat_id)
+        finally:
+            queue.task_done()
+
+
+def _retire_chat(chat_id: int) -> None:
+    CHAT_QUEUES.pop(chat_id, None)
+    CHAT_WORKERS.pop(chat_id, None)
+
+
+def _chat_queue(chat_id: int) -> asyncio.Queue:
+    queue = CHAT_QUEUES.get(chat_id)
+    if queue is None:
+        queue = asyncio.Queue()
+        CHAT_QUEUES[chat_id] = queue
+    worker = CHAT_WORKERS.get(chat_id)
+    # A worker that died (or was cancelled) still sits in CHAT_WORKERS;
+    # replace it so the queued messages get answered.
+    if worker is None or worker.done():
+        CHAT_WORKERS[chat_id] = asyncio.create_task(_chat_worker(chat_id, queue))
+    return queue
+
+
 async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     if not update.message or not update.effective_chat:
         return
 
-    chat_id = update.effective_chat.id
-    if chat_id in PENDING_APPROVALS:
-        await update.message.reply_text("Please approve or reject the pending action first.")
-        return
-
     user_message = (update.message.text or "").strip()
     if not user_message:
         return
 
-    config = _chat_config(chat_id)
-
-    try:
-        APP.invoke({"messages": [HumanMessage(content=user_message)]}, config=config)
-        pending = _resume_until_waiting(config)
-        if pending:
-            PENDING_APPROVALS[chat_id] = pending
-            await _send_approval_prompt(update.message, pending["action"], pending["args"])
-            return
-
-        snapshot = APP.get_state(config)
-        ai_response = _last_ai_text(snapshot.values.get("messages", [])) or "No response generated."
-        await update.message.reply_text(ai_response)
-    except Exception as exc:
-        await update.message.reply_text(f"Agent error: {exc}")
+    # Hand the turn to the chat's worker and return, so the dispatcher can
+    # move on to the next update while the graph runs.
+    await _chat_queue(update.effective_chat.id).put((update.message, user_message))
 
 
 async def handle_approval(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -115,35 +339,45 @@ async def handle_approval(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     await query.answer()
     chat_id = update.effective_chat.id
 
-    pending = PENDING_APPROVALS.get(chat_id)
-    if not pending:
-        await query.edit_message_text("No pending approval found.")
-        return
-
-    approved = query.data == "approval:yes"
-    config = _chat_config(chat_id)
+    async with _chat_lock(chat_id):
+        config = _chat_config(chat_id)
+        snapshot = await asyncio.to_thread(get_app().get_state, config)
+        if _pending_approval(snapshot) is None:
+            # A second tap that queued behind the first: the message already
+            # shows the outcome, so leave it alone.
+            return
 
-    try:
-        APP.update_state(config, {"human_approved": approved})
-        APP.invoke(None, config=config)
-        PENDING_APPROVALS.pop(chat_id, None)
-
-        pending_next = _resume_until_waiting(config)
-        if pending_next:
-            PENDING_APPROVALS[chat_id] = pending_next
-            await query.edit_message_text(
-                f"Approval {'accepted' if approved else 'rejected'}. Next action needs approval:"
-                f"\nAction: {pending_next['action']}\nArgs: {pending_next['args']}"
+        approved = query.data == "approval:yes"
+
+        try:
+            await asyncio.to_thread(get_app().update_state, config, {"human_approved": approved})
+            values = await asyncio.to_thread(get_app().invoke, None, config=config)
+            pending_next, values = await asyncio.to_thread(_resume_until_waiting, config, values)
+            if pending_next:
+                # Independent requests: the status edit and the new prompt go out together.
+                await asyncio.gather(
+                    query.edit_message_text(
+                        f"Approval {'accepted' if approved else 'rejected'}. Next action needs approval:"
+                        f"\nAction: {pending_next['action']}\nArgs: {_format_args(pending_next['args'])}"
+                    ),
+                    _send_approval_prompt(query.message, pending_next["action"], pending_next["args"]),
+                )
+                return
+
+            # The answer goes in its own message so nothing that edits the
+            # approval message later can erase it.
+            await asyncio.gather(
+                query.edit_message_text(f"Approval {'accepted' if approved else 'rejected'}."),
+                query.message.reply_text(_reply_text(values)[:TELEGRAM_MAX_CHARS]),
             )
-            await _send_approval_prompt(query.message, pending_next["action"], pending_next["args"])
-            return
+        except Exception as exc:
+            await query.message.reply_text(f"Agent error: {exc}")
 
-        snapshot = APP.get_state(config)
-        ai_response = _last_ai_text(snapshot.values.get("messages", [])) or "No response generated."
-        await query.edit_message_text(f"Approval {'accepted' if approved else 'rejected'}.")
-        await query.message.reply_text(ai_response)
-    except Exception as exc:
-        await query.message.reply_text(f"Agent error: {exc}")
+
+async def _configure_executor(application) -> None:
+    # asyncio.to_thread uses the loop's default executor; size it for many
+    # chats running graph turns at once.
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=GRAPH_WORKERS))
 
 
 def run_telegram_bot() -> None:
@@ -154,11 +388,40 @@ def run_telegram_bot() -> None:
         print("Missing GROQ_API_KEY in .env")
         return
 
-    app = ApplicationBuilder().token(TELEGRAM_BOT_TOKEN).build()
+    if uvloop is not None:
+        # Faster event loop when available; run_polling/run_webhook pick it up.
+        uvloop.install()
+
+    # Build before serving so worker threads never race to construct it.
+    get_app()
+
+    # Updates are handled concurrently; the per-chat lock restores ordering.
+    app = (
+        ApplicationBuilder()
+        .token(TELEGRAM_BOT_TOKEN)
+        .concurrent_updates(True)
+        # Enough pooled connections for every concurrent turn to send at once.
+        .connection_pool_size(GRAPH_WORKERS)
+        .pool_timeout(10)
+        .post_init(_configure_executor)
+        .build()
+    )
     app.add_handler(CommandHandler("start", start))
-    app.add_handler(CallbackQueryHandler(handle_approval, pattern="^approval:(yes|no)$"))
-    app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_message))
-    app.run_polling()
+    app.add_handler(CallbackQueryHandler(handle_approval, pattern=_APPROVAL_RE))
+    app.add_handler(MessageHandler(_TEXT_FILTER, handle_message))
+
+    if WEBHOOK_URL:
+        # A fixed path keeps the bot token out of proxy and access logs; the
+        # secret token authenticates the requests instead.
+        app.run_webhook(
+            listen=WEBHOOK_LISTEN,
+            port=WEBHOOK_PORT,
+            url_path=WEBHOOK_PATH,
+            webhook_url=f"{WEBHOOK_URL}/{WEBHOOK_PATH}",
+            secret_token=WEBHOOK_SECRET,
+        )
+    else:
+        app.run_polling()
 
 
 if __name__ == "__main__":
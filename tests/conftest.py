@@ -0,0 +1,6 @@
+import os
+
+# Set before any app module is imported: they read the environment at import time.
+os.environ.setdefault("GROQ_API_KEY", "test-key")
+os.environ.setdefault("AGENT_PREWARM_GROQ", "0")
+os.environ.setdefault("ENABLE_TIME_TRACKING", "false")
@@ -0,0 +1,42 @@
+import pytest
+
+from app.env import env_float, env_int, env_true
+
+
+@pytest.mark.parametrize("raw", ["1", "true", "YES", " on "])
+def test_env_true_accepts_truthy_values(monkeypatch, raw):
+    monkeypatch.setenv("FLAG", raw)
+    assert env_true("FLAG") is True
+
+
+@pytest.mark.parametrize("raw", ["0", "false", "no", "off", "maybe"])
+def test_env_true_rejects_everything_else(monkeypatch, raw):
+    monkeypatch.setenv("FLAG", raw)
+    assert env_true("FLAG", True) is False
+
+
+def test_env_true_uses_the_default_when_unset_or_empty(monkeypatch):
+    monkeypatch.delenv("FLAG", raising=False)
+    assert env_true("FLAG", True) is True
+    monkeypatch.setenv("FLAG", "  ")
+    assert env_true("FLAG") is False
+
+
+def test_env_numbers_parse_valid_values(monkeypatch):
+    monkeypatch.setenv("COUNT", " 12 ")
+    monkeypatch.setenv("SECONDS", "0.25")
+    assert env_int("COUNT", 3) == 12
+    assert env_float("SECONDS", 1.0) == 0.25
+
+
+@pytest.mark.parametrize("raw", ["abc", "1.5", "-1"])
+def test_env_int_falls_back_with_a_warning(monkeypatch, caplog, raw):
+    monkeypatch.setenv("COUNT", raw)
+    assert env_int("COUNT", 3, minimum=0) == 3
+    assert "COUNT" in caplog.text
+
+
+def test_env_float_falls_back_below_the_minimum(monkeypatch, caplog):
+    monkeypatch.setenv("SECONDS", "-2")
+    assert env_float("SECONDS", 0.4, minimum=0.0) == 0.4
+    assert "SECONDS" in caplog.text
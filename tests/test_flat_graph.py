@@ -0,0 +1,101 @@
+import threading
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from app.agent import runtime
+from app.agent.tools import task_tools
+from app.graph import FlatGraph
+
+
+@pytest.fixture
+def graph(monkeypatch):
+    """A FlatGraph whose model proposes add_task_tool, then answers in text."""
+    replies = iter(
+        [
+            AIMessage(
+                content="",
+                tool_calls=[{"name": "add_task_tool", "args": {"titles": ["Buy milk"]}, "id": "call_1"}],
+            ),
+            AIMessage(content="Done."),
+        ]
+    )
+    created: list[str] = []
+
+    def fake_add_tasks(titles, notes="", due_iso=""):
+        created.extend(titles)
+        return [{"id": f"t{idx}", "title": title} for idx, title in enumerate(titles)]
+
+    monkeypatch.setattr(runtime, "_cached_invoke", lambda messages, key_messages=None, scope="": next(replies))
+    monkeypatch.setattr(runtime, "_extract_intent_with_ollama", lambda latest_human: None)
+    monkeypatch.setattr(task_tools, "add_tasks", fake_add_tasks)
+    return FlatGraph(), created
+
+
+def _start_turn(app):
+    config = {"configurable": {"thread_id": "t"}}
+    app.invoke({"messages": [HumanMessage(content="add buy milk to my tasks")]}, config=config)
+    assert app.get_state(config).next == ("execute_action",)
+    return config
+
+
+def test_aot_approved_guarded_action_runs_tool(graph):
+    app, created = graph
+    config = _start_turn(app)
+
+    app.update_state(config, {"human_approved": True})
+    values = app.invoke(None, config=config)
+
+    assert created == ["Buy milk"]
+    tool_message = next(m for m in values["messages"] if isinstance(m, ToolMessage))
+    assert tool_message.status == "success"
+    assert tool_message.tool_call_id == "call_1"
+    assert values["messages"][-1].content == "Done."
+    assert app.get_state(config).next == ()
+
+
+def test_aot_rejected_guarded_action_skips_tool(graph):
+    app, created = graph
+    config = _start_turn(app)
+
+    app.update_state(config, {"human_approved": False})
+    values = app.invoke(None, config=config)
+
+    assert created == []
+    tool_message = next(m for m in values["messages"] if isinstance(m, ToolMessage))
+    assert tool_message.content == "Action not approved."
+    assert values["messages"][-1].content == "Done."
+    assert app.get_state(config).next == ()
+
+
+def test_read_only_batch_runs_concurrently_and_returns_to_assistant(monkeypatch):
+    from langchain_core.tools import tool
+
+    both_started = threading.Barrier(2, timeout=2)
+
+    @tool
+    def first_lookup_tool() -> str:
+        """First read-only lookup."""
+        both_started.wait()
+        return "first"
+
+    @tool
+    def second_lookup_tool() -> str:
+        """Second read-only lookup."""
+        both_started.wait()
+        return "second"
+
+    monkeypatch.setitem(runtime.TOOL_BY_NAME, "first_lookup_tool", first_lookup_tool)
+    monkeypatch.setitem(runtime.TOOL_BY_NAME, "second_lookup_tool", second_lookup_tool)
+    ai = AIMessage(
+        content="",
+        tool_calls=[
+            {"name": "first_lookup_tool", "args": {}, "id": "call_1"},
+            {"name": "second_lookup_tool", "args": {}, "id": "call_2"},
+        ],
+    )
+
+    update = runtime.execute_action({"messages": [HumanMessage(content="look both up"), ai]})
+
+    assert [(m.tool_call_id, m.content) for m in update["messages"]] == [("call_1", "first"), ("call_2", "second")]
+    assert runtime.route_after_execute(update) == "assistant"
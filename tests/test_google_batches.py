@@ -0,0 +1,235 @@
+import base64
+
+import pytest
+
+from app.agent.tools import task_tools
+from app.serialization import loads
+from app.tools import gmail, tasks
+
+
+class _Request:
+    def __init__(self, kind, kwargs, response):
+        self.kind = kind
+        self.kwargs = kwargs
+        self.response = response
+
+    def execute(self):
+        return self.response
+
+
+class _Batch:
+    def __init__(self, service, callback):
+        self._service = service
+        self._callback = callback
+        self._requests = []
+
+    def add(self, request, request_id):
+        self._requests.append((request_id, request))
+
+    def execute(self):
+        self._service.batches.append([request for _, request in self._requests])
+        # Replies come back in any order; callers must map them by request id.
+        for request_id, request in reversed(self._requests):
+            if isinstance(request.response, Exception):
+                self._callback(request_id, None, request.response)
+            else:
+                self._callback(request_id, request.response, None)
+
+
+class _FakeService:
+    """Just enough of the discovery client for the batched Gmail and Tasks calls."""
+
+    def __init__(self, responses):
+        self._responses = responses
+        self.batches = []
+        self.direct = []
+
+    def _request(self, kind, **kwargs):
+        return _Request(kind, kwargs, self._responses(kind, kwargs))
+
+    def new_batch_http_request(self, callback):
+        return _Batch(self, callback)
+
+    # Tasks
+    def tasks(self):
+        return self
+
+    def patch(self, **kwargs):
+        return self._request("patch", **kwargs)
+
+    def insert(self, **kwargs):
+        return self._request("insert", **kwargs)
+
+    # Gmail
+    def users(self):
+        return self
+
+    def messages(self):
+        return self
+
+    def list(self, **kwargs):
+        request = self._request("list", **kwargs)
+        self.direct.append(request)
+        return request
+
+    def get(self, **kwargs):
+        return self._request("get", **kwargs)
+
+
+def _gmail_message(message_id, subject, body=None):
+    payload = {
+        "headers": [
+            {"name": "From", "value": "a@example.com"},
+            {"name": "Subject", "value": subject},
+            {"name": "Date", "value": "Mon, 1 Jan 2026"},
+            {"name": "X-Ignored", "value": "x"},
+        ],
+    }
+    if body is not None:
+        payload["mimeType"] = "multipart/alternative"
+        payload["parts"] = [
+            {"mimeType": "text/html", "body": {"data": base64.urlsafe_b64encode(b"<p>html</p>").decode()}},
+            {"mimeType": "text/plain", "body": {"data": base64.urlsafe_b64encode(body.encode()).decode()}},
+        ]
+    return {"id": message_id, "threadId": f"thread-{message_id}", "payload": payload}
+
+
+def _gmail_responses(kind, kwargs):
+    if kind == "list":
+        return {"messages": [{"id": "m1"}, {"id": "m2"}]}
+    body = f"body of {kwargs['id']}" if kwargs["format"] == "full" else None
+    return _gmail_message(kwargs["id"], f"subject {kwargs['id']}", body)
+
+
+def test_get_emails_fetches_every_message_in_one_batch(monkeypatch):
+    service = _FakeService(_gmail_responses)
+    monkeypatch.setattr(gmail, "_gmail_service", lambda: service)
+
+    emails = gmail.get_emails("is:unread", max_results=2)
+
+    assert len(service.batches) == 1
+    assert [request.kwargs["format"] for request in service.batches[0]] == ["full", "full"]
+    assert [email["id"] for email in emails] == ["m1", "m2"]
+    assert emails[0] == {
+        "id": "m1",
+        "threadId": "thread-m1",
+        "from": "a@example.com",
+        "subject": "subject m1",
+        "date": "Mon, 1 Jan 2026",
+        "body": "body of m1",
+    }
+
+
+def test_get_emails_without_body_requests_only_headers(monkeypatch):
+    service = _FakeService(_gmail_responses)
+    monkeypatch.setattr(gmail, "_gmail_service", lambda: service)
+
+    emails = gmail.get_emails(include_body=False)
+
+    requests = service.batches[0]
+    assert {request.kwargs["format"] for request in requests} == {"metadata"}
+    assert requests[0].kwargs["metadataHeaders"] == ["From", "Subject", "Date"]
+    assert all("body" not in email for email in emails)
+
+
+def test_get_emails_skips_the_batch_when_nothing_matches(monkeypatch):
+    service = _FakeService(lambda kind, kwargs: {})
+    monkeypatch.setattr(gmail, "_gmail_service", lambda: service)
+
+    assert gmail.get_emails() == []
+    assert service.batches == []
+
+
+def test_get_emails_raises_a_failed_fetch(monkeypatch):
+    def responses(kind, kwargs):
+        if kind == "get" and kwargs["id"] == "m2":
+            return RuntimeError("boom")
+        return _gmail_responses(kind, kwargs)
+
+    monkeypatch.setattr(gmail, "_gmail_service", lambda: _FakeService(responses))
+
+    with pytest.raises(RuntimeError, match="boom"):
+        gmail.get_emails()
+
+
+def _task_responses(kind, kwargs):
+    return {"id": kwargs["task"], "title": f"task {kwargs['task']}", **kwargs["body"]}
+
+
+def test_complete_task_patches_every_task_in_one_batch(monkeypatch):
+    service = _FakeService(_task_responses)
+    monkeypatch.setattr(tasks, "_tasks_service", lambda: service)
+
+    result = tasks.complete_task(["t1", "t2", "t3"])
+
+    assert len(service.batches) == 1
+    assert [request.kwargs["task"] for request in service.batches[0]] == ["t1", "t2", "t3"]
+    assert [task["id"] for task in result["updated_tasks"]] == ["t1", "t2", "t3"]
+    assert result["title"] == "task t3"
+    assert result["status"] == "completed"
+    # Every task in the batch shares one completion timestamp.
+    assert len({task["completed"] for task in result["updated_tasks"]}) == 1
+
+
+def test_complete_task_with_no_ids_sends_nothing(monkeypatch):
+    service = _FakeService(_task_responses)
+    monkeypatch.setattr(tasks, "_tasks_service", lambda: service)
+
+    result = tasks.complete_task([])
+
+    assert service.batches == []
+    assert result["updated_tasks"] == []
+    assert result["title"] is None
+
+
+def test_complete_task_raises_a_failed_patch(monkeypatch):
+    def responses(kind, kwargs):
+        return ValueError("not found") if kwargs["task"] == "t2" else _task_responses(kind, kwargs)
+
+    monkeypatch.setattr(tasks, "_tasks_service", lambda: _FakeService(responses))
+
+    with pytest.raises(ValueError, match="not found"):
+        tasks.complete_task(["t1", "t2"])
+
+
+def _insert_responses(kind, kwargs):
+    if kwargs["body"]["title"] == "fails":
+        return RuntimeError("quota")
+    return {"id": f"id-{kwargs['body']['title']}", **kwargs["body"]}
+
+
+def test_add_tasks_inserts_every_task_in_one_batch(monkeypatch):
+    service = _FakeService(_insert_responses)
+    monkeypatch.setattr(tasks, "_tasks_service", lambda: service)
+
+    result = tasks.add_tasks(["milk", "fails", "eggs"], notes="shop", due_iso="2026-01-02T09:00:00+00:00")
+
+    assert len(service.batches) == 1
+    assert [request.kwargs["body"]["title"] for request in service.batches[0]] == ["milk", "fails", "eggs"]
+    assert {request.kwargs["body"]["due"] for request in service.batches[0]} == {"2026-01-02T09:00:00Z"}
+    assert result[0] == {"id": "id-milk", "title": "milk", "notes": "shop", "due": "2026-01-02T09:00:00Z"}
+    assert isinstance(result[1], RuntimeError)
+    assert result[2]["id"] == "id-eggs"
+
+
+def test_add_task_tool_reports_per_title_outcomes_in_order(monkeypatch):
+    service = _FakeService(_insert_responses)
+    monkeypatch.setattr(tasks, "_tasks_service", lambda: service)
+    monkeypatch.setattr(task_tools, "require_human_approval", lambda state: None)
+
+    content = task_tools.add_task_tool.invoke({"titles": ["milk", " ", "fails", "eggs"]})
+
+    assert len(service.batches) == 1
+    assert loads(content) == {"created": ["milk", "eggs"], "errors": ["Empty title skipped", {"fails": "quota"}]}
+
+
+def test_add_task_tool_reports_a_bad_due_date_for_every_title(monkeypatch):
+    service = _FakeService(_insert_responses)
+    monkeypatch.setattr(tasks, "_tasks_service", lambda: service)
+    monkeypatch.setattr(task_tools, "require_human_approval", lambda state: None)
+
+    content = loads(task_tools.add_task_tool.invoke({"titles": ["milk", "eggs"], "due_iso": "soon"}))
+
+    assert service.batches == []
+    assert content["created"] == []
+    assert [list(error) for error in content["errors"]] == [["milk"], ["eggs"]]
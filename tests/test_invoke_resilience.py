@@ -0,0 +1,78 @@
+import pytest
+from langchain_core.messages import AIMessage, AIMessageChunk
+
+from app.agent import runtime
+from app.agent.streaming import stream_to
+
+
+class _Model:
+    """Streams `tokens`, optionally failing with a rate limit after `fail_after` of them."""
+
+    def __init__(self, tokens, fail_after=None):
+        self.tokens = tokens
+        self.fail_after = fail_after
+        self.streamed = 0
+        self.invoked = 0
+
+    def stream(self, messages):
+        self.streamed += 1
+        for idx, token in enumerate(self.tokens):
+            if idx == self.fail_after:
+                raise RuntimeError("429 rate limit exceeded")
+            yield AIMessageChunk(content=token)
+
+    def invoke(self, messages):
+        self.invoked += 1
+        return AIMessage(content="".join(self.tokens))
+
+
+@pytest.fixture(autouse=True)
+def _no_backoff(monkeypatch):
+    monkeypatch.setattr(runtime.time, "sleep", lambda seconds: None)
+
+
+def _models(monkeypatch, *models, fallback=None):
+    queue = list(models)
+    monkeypatch.setattr(runtime, "_llm_with_tools", lambda: queue.pop(0) if len(queue) > 1 else queue[0])
+    monkeypatch.setattr(runtime, "_ollama_with_tools", lambda: fallback)
+
+
+def test_retry_after_a_mid_stream_failure_does_not_repeat_tokens(monkeypatch):
+    flaky = _Model(["Hel", "lo"], fail_after=1)
+    healthy = _Model(["Hel", "lo"])
+    _models(monkeypatch, flaky, healthy)
+    tokens = []
+
+    with stream_to(tokens.append):
+        reply = runtime.invoke_with_resilience([])
+
+    assert reply.content == "Hello"
+    assert tokens == ["Hel"]
+    assert (healthy.streamed, healthy.invoked) == (0, 1)
+
+
+def test_fallback_after_partial_stream_is_not_streamed(monkeypatch):
+    flaky = _Model(["Hel", "lo"], fail_after=1)
+    fallback = _Model(["Hi"])
+    _models(monkeypatch, flaky, fallback=fallback)
+    tokens = []
+
+    with stream_to(tokens.append):
+        reply = runtime.invoke_with_resilience([], retries=0)
+
+    assert reply.content == "Hi"
+    assert tokens == ["Hel"]
+    assert (fallback.streamed, fallback.invoked) == (0, 1)
+
+
+def test_retry_keeps_streaming_when_nothing_was_shown_yet(monkeypatch):
+    rejected = _Model(["Hel", "lo"], fail_after=0)
+    healthy = _Model(["Hel", "lo"])
+    _models(monkeypatch, rejected, healthy)
+    tokens = []
+
+    with stream_to(tokens.append):
+        reply = runtime.invoke_with_resilience([])
+
+    assert reply.content == "Hello"
+    assert tokens == ["Hel", "lo"]
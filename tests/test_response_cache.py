@@ -0,0 +1,66 @@
+from datetime import datetime
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+from app.agent import runtime
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    calls = []
+
+    def fake_invoke(messages):
+        calls.append(messages)
+        return AIMessage(
+            content="",
+            id="run-1",
+            tool_calls=[{"name": "list_tasks_tool", "args": {}, "id": "call_1"}],
+        )
+
+    monkeypatch.setattr(runtime, "RESPONSE_CACHE_ENABLED", True)
+    monkeypatch.setattr(runtime, "invoke_with_resilience", fake_invoke)
+    runtime._RESPONSE_CACHE.clear()
+    return calls
+
+
+def _at(monkeypatch, hour, minute, second):
+    monkeypatch.setattr(runtime, "_local_now", lambda: ("UTC", datetime(2026, 1, 1, hour, minute, second)))
+
+
+def _invoke(conversation, now_text, scope="thread-1"):
+    return runtime._cached_invoke(
+        [*conversation, SystemMessage(content=now_text)], key_messages=conversation, scope=scope
+    )
+
+
+def test_cache_hits_within_the_minute_with_fresh_tool_call_ids(monkeypatch, calls):
+    conversation = [HumanMessage(content="show my tasks")]
+    _at(monkeypatch, 10, 0, 1)
+    first = _invoke(conversation, "Now: 10:00:01")
+    _at(monkeypatch, 10, 0, 59)
+    second = _invoke(conversation, "Now: 10:00:59")
+
+    assert len(calls) == 1
+    assert second.id is None
+    assert first.tool_calls[0]["id"] != second.tool_calls[0]["id"]
+    assert "call_1" not in {first.tool_calls[0]["id"], second.tool_calls[0]["id"]}
+
+
+def test_cache_misses_once_the_minute_changes(monkeypatch, calls):
+    conversation = [HumanMessage(content="remind me in an hour")]
+    _at(monkeypatch, 10, 0, 59)
+    _invoke(conversation, "Now: 10:00:59")
+    _at(monkeypatch, 10, 1, 0)
+    _invoke(conversation, "Now: 10:01:00")
+
+    assert len(calls) == 2
+
+
+def test_cache_is_not_shared_across_threads(monkeypatch, calls):
+    conversation = [HumanMessage(content="show my tasks")]
+    _at(monkeypatch, 10, 0, 1)
+    _invoke(conversation, "Now: 10:00:01", scope="telegram-1")
+    _invoke(conversation, "Now: 10:00:01", scope="telegram-2")
+
+    assert len(calls) == 2
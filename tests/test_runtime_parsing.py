@@ -0,0 +1,68 @@
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+from app.agent import runtime
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["time", "what time is it?", "What's the time", "what is the current time now?", "  TIME IS IT  "],
+)
+def test_time_questions_are_answered_directly(text):
+    assert runtime._match_direct_intent(text) is runtime._answer_time
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["what's the date?", "what is the day today", "what day is it", "What day is today?"],
+)
+def test_date_questions_are_answered_directly(text):
+    assert runtime._match_direct_intent(text) is runtime._answer_date
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "what time is it in Tokyo?",
+        "time of my next meeting",
+        "what's the date of the launch?",
+        "remind me what day it is tomorrow",
+        "",
+    ],
+)
+def test_questions_with_context_go_to_the_model(text):
+    assert runtime._match_direct_intent(text) is None
+
+
+def test_direct_intent_only_looks_at_a_trailing_human_message():
+    assert runtime._direct_intent([HumanMessage(content="what time is it")]) is runtime._answer_time
+    assert runtime._direct_intent([HumanMessage(content="what time is it"), AIMessage(content="It's 9 AM.")]) is None
+    assert runtime._direct_intent([HumanMessage(content=[{"type": "text", "text": "time"}])]) is None
+    assert runtime._direct_intent([]) is None
+
+
+def test_route_from_start_and_direct_responder_agree():
+    state = {"messages": [HumanMessage(content="what's the date?")]}
+
+    assert runtime.route_from_start(state) == "direct_responder"
+    reply = runtime.direct_responder(state)["messages"][0].content
+    assert reply.startswith("Today is ")
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ('{"intent": "tasks"}', {"intent": "tasks"}),
+        ('```json\n{"intent": "tasks"}\n```', {"intent": "tasks"}),
+        ('```\n{"intent": "tasks"}\n```', {"intent": "tasks"}),
+        ('Sure! Here it is: {"intent": "tasks", "n": 2} Hope that helps.', {"intent": "tasks", "n": 2}),
+        ("[1, 2]", [1, 2]),
+    ],
+)
+def test_parse_json_reply_accepts_fenced_and_wrapped_json(text, expected):
+    assert runtime._parse_json_reply(text) == expected
+
+
+@pytest.mark.parametrize("text", ["not json", "{broken", "", None, 42, ["a"]])
+def test_parse_json_reply_returns_none_for_unparseable_replies(text):
+    assert runtime._parse_json_reply(text) is None
@@ -0,0 +1,79 @@
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from app.agent import runtime, semantic_cache
+
+
+def _remembered(monkeypatch, messages, scope="thread-1"):
+    stored = []
+    monkeypatch.setattr(runtime.semantic_cache, "is_enabled", lambda: True)
+    monkeypatch.setattr(
+        runtime.semantic_cache, "store", lambda scope, query, answer: stored.append((scope, query, answer))
+    )
+    latest_human, used_tools = runtime._scan_current_turn(messages)
+    query = runtime._semantic_query(messages, latest_human)
+    runtime._remember_semantic_answer(scope, query, used_tools, AIMessage(content="answer"))
+    return stored
+
+
+def test_answers_built_from_tool_output_are_not_cached(monkeypatch):
+    messages = [
+        HumanMessage(content="what's on my calendar?"),
+        AIMessage(content="", tool_calls=[{"name": "list_events_tool", "args": {}, "id": "call_1"}]),
+        ToolMessage(content="[]", tool_call_id="call_1"),
+    ]
+    assert _remembered(monkeypatch, messages) == []
+
+
+def test_tool_free_answers_are_cached_for_their_thread(monkeypatch):
+    messages = [HumanMessage(content="what does PTO stand for?")]
+    assert _remembered(monkeypatch, messages) == [("thread-1", "what does PTO stand for?", "answer")]
+
+
+def test_follow_ups_are_keyed_on_the_previous_answer(monkeypatch):
+    messages = [
+        HumanMessage(content="search for flights"),
+        AIMessage(content="", tool_calls=[{"name": "web_search_tool", "args": {}, "id": "call_1"}]),
+        ToolMessage(content="[]", tool_call_id="call_1"),
+        AIMessage(content="I found no flights."),
+        HumanMessage(content="translate that to French"),
+    ]
+    assert _remembered(monkeypatch, messages) == [
+        ("thread-1", "I found no flights.\n\ntranslate that to French", "answer")
+    ]
+
+
+@pytest.mark.parametrize("text", ["what time is it in Tokyo?", "how many days until Friday", "latest score"])
+def test_time_sensitive_questions_skip_the_cache(monkeypatch, text):
+    assert _remembered(monkeypatch, [HumanMessage(content=text)]) == []
+
+
+@pytest.fixture
+def fake_embeddings(monkeypatch):
+    np = pytest.importorskip("numpy")
+    vectors = {"hello": [1.0, 0.0], "hi there": [0.99, 0.14], "unrelated": [0.0, 1.0]}
+
+    monkeypatch.setattr(semantic_cache, "np", np)
+    monkeypatch.setattr(semantic_cache, "SentenceTransformer", object)
+    monkeypatch.setattr(semantic_cache, "SEMANTIC_CACHE_ENABLED", True)
+    monkeypatch.setattr(semantic_cache, "_embed", lambda text: np.asarray(vectors[text], dtype=np.float32))
+    monkeypatch.setattr(semantic_cache, "_matrix", None)
+    monkeypatch.setattr(semantic_cache, "_answers", [])
+    monkeypatch.setattr(semantic_cache, "_expires", [])
+    monkeypatch.setattr(semantic_cache, "_scopes", [])
+
+
+def test_lookup_only_matches_entries_from_the_same_scope(fake_embeddings):
+    semantic_cache.store("chat-a", "hello", "Hi, Alice!")
+
+    assert semantic_cache.lookup("chat-a", "hi there") == "Hi, Alice!"
+    assert semantic_cache.lookup("chat-b", "hi there") is None
+    assert semantic_cache.lookup("chat-a", "unrelated") is None
+
+
+def test_lookup_prefers_the_scope_match_over_a_closer_foreign_entry(fake_embeddings):
+    semantic_cache.store("chat-a", "hi there", "Hi, Alice!")
+    semantic_cache.store("chat-b", "hello", "Hi, Bob!")
+
+    assert semantic_cache.lookup("chat-a", "hello") == "Hi, Alice!"
+    assert semantic_cache.lookup("chat-b", "hello") == "Hi, Bob!"
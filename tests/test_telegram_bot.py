@@ -0,0 +1,222 @@
+import asyncio
+
+import pytest
+from langchain_core.messages import AIMessage
+from telegram.error import NetworkError, TimedOut
+
+import telegram_bot
+
+
+class _Message:
+    def __init__(self, fail_replies=False):
+        self.replies = []
+        self._fail_replies = fail_replies
+
+    async def reply_text(self, text, **kwargs):
+        if self._fail_replies:
+            raise RuntimeError("telegram is down")
+        self.replies.append(text)
+
+
+class _BrokenApp:
+    def get_state(self, config):
+        raise RuntimeError("checkpoint unavailable")
+
+
+@pytest.fixture(autouse=True)
+def _clean_chat_state():
+    yield
+    telegram_bot.CHAT_QUEUES.clear()
+    telegram_bot.CHAT_WORKERS.clear()
+    telegram_bot.CHAT_LOCKS.clear()
+
+
+def test_worker_survives_a_turn_whose_error_reply_fails(monkeypatch):
+    handled = []
+
+    async def fake_turn(chat_id, message, user_message):
+        if user_message == "first":
+            raise RuntimeError("reply failed")
+        handled.append(user_message)
+
+    monkeypatch.setattr(telegram_bot, "_run_chat_turn", fake_turn)
+
+    async def scenario():
+        queue = telegram_bot._chat_queue(1)
+        await queue.put((_Message(), "first"))
+        await queue.put((_Message(), "second"))
+        await asyncio.wait_for(queue.join(), 1)
+        assert not telegram_bot.CHAT_WORKERS[1].done()
+
+    asyncio.run(scenario())
+    assert handled == ["second"]
+
+
+def test_chat_queue_replaces_a_dead_worker(monkeypatch):
+    handled = []
+
+    async def fake_turn(chat_id, message, user_message):
+        handled.append(user_message)
+
+    monkeypatch.setattr(telegram_bot, "_run_chat_turn", fake_turn)
+
+    async def scenario():
+        queue = telegram_bot._chat_queue(1)
+        dead = telegram_bot.CHAT_WORKERS[1]
+        dead.cancel()
+        await asyncio.sleep(0)
+        assert dead.done()
+
+        assert telegram_bot._chat_queue(1) is queue
+        assert telegram_bot.CHAT_WORKERS[1] is not dead
+        await queue.put((_Message(), "hello"))
+        await asyncio.wait_for(queue.join(), 1)
+
+    asyncio.run(scenario())
+    assert handled == ["hello"]
+
+
+def test_turn_failure_is_reported_to_the_chat(monkeypatch):
+    monkeypatch.setattr(telegram_bot, "get_app", lambda: _BrokenApp())
+    message = _Message()
+
+    asyncio.run(telegram_bot._run_chat_turn(1, message, "hi"))
+
+    assert message.replies == ["Agent error: checkpoint unavailable"]
+    assert telegram_bot.CHAT_LOCKS == {}
+
+
+def test_worker_keeps_going_when_the_error_reply_cannot_be_sent(monkeypatch):
+    monkeypatch.setattr(telegram_bot, "get_app", lambda: _BrokenApp())
+    working = _Message()
+
+    async def scenario():
+        queue = telegram_bot._chat_queue(1)
+        await queue.put((_Message(fail_replies=True), "first"))
+        await queue.put((working, "second"))
+        await asyncio.wait_for(queue.join(), 1)
+
+    asyncio.run(scenario())
+    assert working.replies == ["Agent error: checkpoint unavailable"]
+
+
+class _StreamTarget:
+    """A message whose sends fail with the queued errors, in order."""
+
+    def __init__(self, failures=()):
+        self.sent = []
+        self.edits = []
+        self._failures = list(failures)
+
+    def _maybe_fail(self):
+        if self._failures:
+            raise self._failures.pop(0)
+
+    async def reply_text(self, text, **kwargs):
+        self._maybe_fail()
+        self.sent.append(text)
+        return self
+
+    async def edit_text(self, text, **kwargs):
+        self._maybe_fail()
+        self.edits.append(text)
+
+
+def _stream(target, tokens):
+    async def scenario():
+        streamed = telegram_bot._StreamedReply(target)
+        streamed.start()
+        for token in tokens:
+            streamed.on_token(token)
+            await asyncio.sleep(0.03)
+        await streamed.finish("final answer")
+
+    asyncio.run(scenario())
+
+
+def test_stream_timeout_does_not_lose_the_final_answer(monkeypatch):
+    monkeypatch.setattr(telegram_bot, "STREAM_EDIT_SECONDS", 0.01)
+    target = _StreamTarget([TimedOut()])
+
+    _stream(target, ["final "])
+
+    visible = target.edits[-1] if target.edits else target.sent[-1]
+    assert visible == "final answer"
+
+
+def test_failed_final_edit_falls_back_to_a_new_message(monkeypatch):
+    monkeypatch.setattr(telegram_bot, "STREAM_EDIT_SECONDS", 0.01)
+    target = _StreamTarget()
+
+    async def scenario():
+        streamed = telegram_bot._StreamedReply(target)
+        streamed.start()
+        streamed.on_token("final")
+        await asyncio.sleep(0.05)
+        assert target.sent == ["final"]
+        target._failures.append(NetworkError("connection reset"))
+        await streamed.finish("final answer")
+
+    asyncio.run(scenario())
+    assert target.sent == ["final", "final answer"]
+
+
+class _Snapshot:
+    def __init__(self, next_nodes, values):
+        self.next = next_nodes
+        self.values = values
+
+
+class _ApprovalApp:
+    """Paused on add_task_tool until the first approval resumes it."""
+
+    def __init__(self):
+        self.pending = True
+
+    def get_state(self, config):
+        if not self.pending:
+            return _Snapshot((), {})
+        return _Snapshot(("execute_action",), {"planned_action": {"name": "add_task_tool", "args": {}}})
+
+    def update_state(self, config, values):
+        pass
+
+    def invoke(self, state, config):
+        self.pending = False
+        return {"messages": [AIMessage(content="Task added.")]}
+
+
+class _Query:
+    def __init__(self, message):
+        self.data = "approval:yes"
+        self.message = message
+        self.edits = []
+
+    async def answer(self, *args, **kwargs):
+        pass
+
+    async def edit_message_text(self, text, **kwargs):
+        self.edits.append(text)
+
+
+class _Update:
+    def __init__(self, query):
+        self.callback_query = query
+        self.effective_chat = type("Chat", (), {"id": 1})()
+
+
+def test_a_second_approval_tap_does_not_erase_the_answer(monkeypatch):
+    monkeypatch.setattr(telegram_bot, "get_app", lambda app=_ApprovalApp(): app)
+    message = _Message()
+    first, second = _Query(message), _Query(message)
+
+    async def scenario():
+        await asyncio.gather(
+            telegram_bot.handle_approval(_Update(first), None),
+            telegram_bot.handle_approval(_Update(second), None),
+        )
+
+    asyncio.run(scenario())
+    assert first.edits == ["Approval accepted."]
+    assert second.edits == []
+    assert message.replies == ["Task added."]
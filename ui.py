@@ -6,7 +6,9 @@ import streamlit as st
 from dotenv import load_dotenv
 from langchain_core.messages import AIMessage, HumanMessage
 
-from app.graph import GUARDED_ACTIONS, build_graph
+from app.agent import route_after_assistant
+from app.agent.streaming import stream_to
+from app.graph import GUARDED_ACTIONS, get_app as get_shared_app
 from app.observability import langsmith_traceable, timed, timed_block
 
 load_dotenv()
@@ -15,10 +17,15 @@ if not os.getenv("GROQ_API_KEY"):
 
 st.set_page_config(page_title="Local Agent UI", page_icon="🤖", layout="wide")
 
+# Upper bound on non-guarded actions run back to back without user input.
+MAX_AUTO_APPROVED_STEPS = 32
+# Longest list shown per argument in the approval preview.
+MAX_PREVIEW_ITEMS = 50
+
 
 @st.cache_resource
 def get_app():
-    return build_graph()
+    return get_shared_app()
 
 
 def init_state() -> None:
@@ -28,33 +35,68 @@ def init_state() -> None:
         st.session_state.config = {"configurable": {"thread_id": st.session_state.thread_id}}
     if "pending_approval" not in st.session_state:
         st.session_state.pending_approval = None
+    if "message_texts" not in st.session_state:
+        st.session_state.message_texts = {}
 
 
 def _message_text(message: Any) -> str:
     content = getattr(message, "content", "")
     if isinstance(content, str):
         return content
-    return str(content)
-
-
-def _sync_pending_approval(app) -> None:
+    # Non-string content (content blocks) is stringified once per message and
+    # reused on later reruns.
+    texts = st.session_state.message_texts
+    message_id = getattr(message, "id", None)
+    if message_id is None:
+        return str(content)
+    text = texts.get(message_id)
+    if text is None:
+        text = str(content)
+        texts[message_id] = text
+    return text
+
+
+def _preview_args(args: dict[str, Any]) -> dict[str, Any]:
+    """Cut long list arguments (e.g. many task ids) down for display."""
+    preview = {}
+    for key, value in args.items():
+        if isinstance(value, list) and len(value) > MAX_PREVIEW_ITEMS:
+            value = [*value[:MAX_PREVIEW_ITEMS], f"... {len(value) - MAX_PREVIEW_ITEMS} more"]
+        preview[key] = value
+    return preview
+
+
+def _sync_pending_approval(app) -> dict[str, Any]:
+    """Settle auto-approved actions and return the latest graph state values."""
     snapshot = app.get_state(st.session_state.config)
     if not snapshot.next or "execute_action" not in snapshot.next:
         st.session_state.pending_approval = None
-        return
+        return snapshot.values
+
+    values = snapshot.values
+    # The graph only pauses before execute_action, so the state returned by
+    # invoke says whether it stopped there again.
+    for _ in range(MAX_AUTO_APPROVED_STEPS):
+        if route_after_assistant(values) != "execute_action":
+            break
+        planned = values.get("planned_action", {})
+        action_name = planned.get("name", "respond")
+
+        if action_name in GUARDED_ACTIONS:
+            st.session_state.pending_approval = {
+                "action": action_name,
+                "args": planned.get("args", {}),
+            }
+            return values
 
-    planned = snapshot.values.get("planned_action", {})
-    action_name = planned.get("name", "respond")
-
-    if action_name in GUARDED_ACTIONS:
-        st.session_state.pending_approval = {
-            "action": action_name,
-            "args": planned.get("args", {}),
-        }
-    else:
         app.update_state(st.session_state.config, {"human_approved": True})
-        app.invoke(None, config=st.session_state.config)
-        _sync_pending_approval(app)
+        values = app.invoke(None, config=st.session_state.config)
+    else:
+        if route_after_assistant(values) == "execute_action":
+            st.error("Agent exceeded tool-chain depth")
+
+    st.session_state.pending_approval = None
+    return values
 
 
 @langsmith_traceable(name="ui_run_user_turn", run_type="chain")
@@ -74,9 +116,8 @@ def _resume_with_approval(app, approved: bool) -> None:
         _sync_pending_approval(app)
 
 
-def _render_chat(app) -> None:
-    snapshot = app.get_state(st.session_state.config)
-    messages = snapshot.values.get("messages", [])
+def _render_chat(values: dict[str, Any]) -> None:
+    messages = values.get("messages", [])
 
     if not messages:
         st.info("Ask something like: 'Show unread emails' or 'Find a 30-min free slot tomorrow'.")
@@ -87,8 +128,12 @@ def _render_chat(app) -> None:
             with st.chat_message("user"):
                 st.write(_message_text(msg))
         elif isinstance(msg, AIMessage):
+            text = _message_text(msg)
+            # Tool-call steps carry no text; skip their empty bubbles.
+            if not text:
+                continue
             with st.chat_message("assistant"):
-                st.code(_message_text(msg), language="json")
+                st.code(text, language="json")
 
 
 def main() -> None:
@@ -109,15 +154,17 @@ def main() -> None:
             st.session_state.thread_id = str(uuid.uuid4())
             st.session_state.config = {"configurable": {"thread_id": st.session_state.thread_id}}
             st.session_state.pending_approval = None
+            st.session_state.message_texts = {}
             st.rerun()
 
-    _sync_pending_approval(app)
+    # One state read per rerun, shared by the approval check and the transcript.
+    values = _sync_pending_approval(app)
 
     pending = st.session_state.pending_approval
     if pending:
         st.warning("Approval required before executing a sensitive action.")
         st.write(f"Action: `{pending['action']}`")
-        st.json(pending["args"])
+        st.json(_preview_args(pending["args"]))
 
         approve_col, reject_col = st.columns(2)
         with approve_col:
@@ -129,11 +176,23 @@ def main() -> None:
                 _resume_with_approval(app, False)
                 st.rerun()
 
-    _render_chat(app)
+    _render_chat(values)
 
     prompt = st.chat_input("Message the agent")
     if prompt:
-        _run_user_turn(app, prompt)
+        with st.chat_message("user"):
+            st.write(prompt)
+        with st.chat_message("assistant"):
+            placeholder = st.empty()
+
+        streamed: list[str] = []
+
+        def _show_token(text: str) -> None:
+            streamed.append(text)
+            placeholder.markdown("".join(streamed))
+
+        with stream_to(_show_token):
+            _run_user_turn(app, prompt)
         st.rerun()
 
 